@@ -141,15 +141,22 @@ class ObservationalDataCollector(DataCollector):
     def __init__(self, scenario: Scenario, data: pd.DataFrame):
         super().__init__(scenario)
         self.data = data
+        # The filtered data, together with the data and scenario it was filtered from
+        self._collected = (None, None, None)
 
     def collect_data(self, **kwargs) -> pd.DataFrame:
         """Read a pandas dataframe and filter to remove
         any data which is invalid for the scenario-under-test.
 
         Data is invalid if it does not meet the constraints outlined in the scenario-under-test (Scenario).
+        The filtered data is cached until `self.data` or `self.scenario` is replaced, so neither should be modified in
+        place. Each call returns its own copy of the cached data, which callers are free to modify.
 
         :return: A pandas dataframe containing execution data that is valid for the scenario-under-test.
         """
+        collected_data, collected_from, collected_for = self._collected
+        if collected_data is not None and collected_from is self.data and collected_for is self.scenario:
+            return collected_data.copy()
         execution_data_df = self.data
         for meta in self.scenario.metas():
             if meta.name not in self.data:
@@ -158,4 +165,5 @@ class ObservationalDataCollector(DataCollector):
         for var_name, var in self.scenario.variables.items():
             if issubclass(var.datatype, Enum):
                 scenario_execution_data_df[var_name] = [var.datatype(x) for x in scenario_execution_data_df[var_name]]
-        return scenario_execution_data_df
+        self._collected = (scenario_execution_data_df, execution_data_df, self.scenario)
+        return scenario_execution_data_df.copy()
@@ -6,7 +6,6 @@ from abc import abstractmethod
 
 import pandas as pd
 from statsmodels.regression.linear_model import RegressionResultsWrapper
-from patsy import dmatrix  # pylint: disable = no-name-in-module
 
 from causal_testing.specification.variable import Variable
 from causal_testing.estimation.abstract_estimator import Estimator
@@ -17,6 +16,9 @@ logger = logging.getLogger(__name__)
 class RegressionEstimator(Estimator):
     """A Linear Regression Estimator is a parametric estimator which restricts the variables in the data to a linear
     combination of parameters and functions of the variables (note these functions need not be linear).
+
+    The fitted model is reused between estimates until `df` or `formula` is replaced. To change the data, assign a new
+    dataframe to `df` rather than modifying the existing one in place, otherwise estimates may come from a stale model.
     """
 
     def __init__(
@@ -46,16 +48,26 @@ class RegressionEstimator(Estimator):
         )
 
         self.model = None
-        if effect_modifiers is None:
-            effect_modifiers = []
+        self._fit_key = None
         if adjustment_set is None:
             adjustment_set = []
         if formula is not None:
             self.formula = formula
         else:
-            terms = [treatment] + sorted(list(adjustment_set)) + sorted(list(effect_modifiers))
+            terms = [treatment] + sorted(adjustment_set) + sorted(self.effect_modifiers)
             self.formula = f"{outcome} ~ {'+'.join(terms)}"
 
+    @property
+    def df(self) -> pd.DataFrame:
+        """The data to fit the model to. Assigning new data drops the model fitted to the previous data."""
+        return self._df
+
+    @df.setter
+    def df(self, df: pd.DataFrame):
+        self._df = df
+        self.model = None
+        self._fit_key = None
+
     @property
     @abstractmethod
     def regressor(self):
@@ -79,42 +91,63 @@ class RegressionEstimator(Estimator):
 
     def _run_regression(self, data=None) -> RegressionResultsWrapper:
         """Run logistic regression of the treatment and adjustment set against the outcome and return the model.
+        The fitted model is cached, so repeated calls on the same data with the same formula do not refit.
 
         :return: The model after fitting to data.
         """
         if data is None:
             data = self.df
-        model = self.regressor(formula=self.formula, data=data).fit(disp=0)
+        # The fitted model holds a reference to `data`, so its id cannot be recycled while the cache is live
+        fit_key = (id(data), self.formula)
+        if self.model is not None and self._fit_key == fit_key:
+            return self.model
+        model = self._fit(data)
         self.model = model
+        self._fit_key = fit_key
         return model
 
+    def _fit(self, data: pd.DataFrame) -> RegressionResultsWrapper:
+        """Fit the regressor to the data using the estimator's formula.
+
+        :param data: The data to fit to.
+
+        :return: The fitted model.
+        """
+        return self.regressor(formula=self.formula, data=data).fit(disp=0)
+
     def _predict(self, data=None, adjustment_config: dict = None) -> pd.DataFrame:
         """Estimate the outcomes under control and treatment.
 
         :param data: The data to use, defaults to `self.df`. Controllable for boostrap sampling.
         :param: adjustment_config: The values of the adjustment variables to use.
 
-        :return: The estimated outcome under control and treatment, with confidence intervals in the form of a
-                 dataframe with columns "predicted", "se", "ci_lower", and "ci_upper".
+        :return: The estimated outcome under treatment and control, with confidence intervals in the form of a
+                 dataframe with columns "mean", "mean_ci_lower", and "mean_ci_upper".
         """
         if adjustment_config is None:
             adjustment_config = {}
 
         model = self._run_regression(data)
 
-        x = pd.DataFrame(columns=self.df.columns)
-        x["Intercept"] = 1  # self.intercept
-        x[self.treatment] = [self.treatment_value, self.control_value]
+        # Only allocate the columns we populate. Any other column of self.df would be left empty, so could not be
+        # used by the formula anyway.
+        x = pd.DataFrame({self.treatment: [self.treatment_value, self.control_value]})
 
         for k, v in adjustment_config.items():
             x[k] = v
         for k, v in self.effect_modifiers.items():
             x[k] = v
-        x = dmatrix(self.formula.split("~")[1], x, return_type="dataframe")
-        for col in x:
-            if str(x.dtypes[col]) == "object":
-                x = pd.get_dummies(x, columns=[col], drop_first=True)
+        return self._predict_with_ci(model, x)
 
-        # This has to be here in case the treatment variable is in an I(...) block in the self.formula
-        x[self.treatment] = [self.treatment_value, self.control_value]
+    def _predict_with_ci(self, model: RegressionResultsWrapper, x: pd.DataFrame) -> pd.DataFrame:
+        """Predict the mean outcome, with confidence intervals, for each individual.
+
+        :param model: The fitted model.
+        :param x: The variable values of the individuals to predict the outcome of.
+
+        :return: The predicted outcomes in the form of a dataframe with columns "mean", "mean_ci_lower", and
+                 "mean_ci_upper".
+        """
+        # get_prediction applies the design info of the fitted model to x, so any transformations of the variables in
+        # the formula (e.g. I(...) blocks) are handled for us. The intervals are at summary_frame's default 95% level.
         return model.get_prediction(x).summary_frame()
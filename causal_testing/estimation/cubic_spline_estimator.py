@@ -4,7 +4,9 @@ continuous outcomes with changes in behaviour"""
 import logging
 from typing import Any
 
+import numpy as np
 import pandas as pd
+from patsy import dmatrix  # pylint: disable = no-name-in-module
 
 from causal_testing.specification.variable import Variable
 from causal_testing.estimation.linear_regression_estimator import LinearRegressionEstimator
@@ -38,11 +40,8 @@ class CubicSplineRegressionEstimator(LinearRegressionEstimator):
 
         self.expected_relationship = expected_relationship
 
-        if effect_modifiers is None:
-            effect_modifiers = []
-
         if formula is None:
-            terms = [treatment] + sorted(list(adjustment_set)) + sorted(list(effect_modifiers))
+            terms = [treatment] + sorted(adjustment_set) + sorted(self.effect_modifiers)
             self.formula = f"{outcome} ~ cr({'+'.join(terms)}, df={basis})"
 
     def estimate_ate_calculated(self, adjustment_config: dict = None) -> pd.Series:
@@ -57,19 +56,35 @@ class CubicSplineRegressionEstimator(LinearRegressionEstimator):
 
         :return: The average treatment effect.
         """
+        # The batch method takes one value per pair, so only scalars need wrapping. Array-likes already hold one value.
+        adjustment_config = {k: [v] if np.isscalar(v) else v for k, v in (adjustment_config or {}).items()}
+        ate = self.estimate_ate_calculated_batch([[self.control_value, self.treatment_value]], adjustment_config)
+        return pd.Series(ate)
+
+    def estimate_ate_calculated_batch(self, pairs: np.ndarray, adjustment_config: dict = None) -> np.ndarray:
+        """Estimate the ate effect of the treatment on the outcome, as in `estimate_ate_calculated`, for several
+        individuals at once. The expected outcomes of every individual under control and treatment are predicted
+        together, rather than calling `estimate_ate_calculated` once per individual.
+
+        :param pairs: A (k, 2) array of (control_value, treatment_value) pairs.
+        :param adjustment_config: The configuration of the adjustment set as a dict mapping variable names to arrays of
+                                  their k values, one for each pair.
+
+        :return: An array of the k average treatment effects.
+        """
         model = self._run_regression()
+        pairs = np.asarray(pairs, dtype=float)
+        k = len(pairs)
 
-        x = {"Intercept": 1, self.treatment: self.treatment_value}
+        # Row i is the treated individual of the i-th pair, and row k + i is its control
+        x = {self.treatment: np.concatenate([pairs[:, 1], pairs[:, 0]])}
         if adjustment_config is not None:
-            for k, v in adjustment_config.items():
-                x[k] = v
+            for name, values in adjustment_config.items():
+                x[name] = np.tile(values, 2)
         if self.effect_modifiers is not None:
-            for k, v in self.effect_modifiers.items():
-                x[k] = v
-
-        treatment = model.predict(x).iloc[0]
-
-        x[self.treatment] = self.control_value
-        control = model.predict(x).iloc[0]
+            for name, value in self.effect_modifiers.items():
+                x[name] = np.full(2 * k, value)
 
-        return pd.Series(treatment - control)
+        # Reuse the design info of the fitted model rather than going through statsmodels' predict
+        outcomes = np.asarray(dmatrix(model.model.data.design_info, x)) @ model.params.to_numpy()
+        return outcomes[:k] - outcomes[k:]
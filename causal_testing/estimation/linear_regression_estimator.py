@@ -3,8 +3,13 @@
 import logging
 from typing import Any
 
+import numpy as np
 import pandas as pd
+import scipy.linalg
+from scipy import stats
+from scipy.linalg.blas import dsyrk  # pylint: disable=no-name-in-module
 import statsmodels.formula.api as smf
+from statsmodels.regression.linear_model import OLSResults, RegressionResultsWrapper
 from patsy import dmatrix, ModelDesc  # pylint: disable = no-name-in-module
 
 from causal_testing.specification.variable import Variable
@@ -14,6 +19,34 @@ from causal_testing.estimation.abstract_regression_estimator import RegressionEs
 logger = logging.getLogger(__name__)
 
 
+def _standard_errors(rows: np.ndarray, cov: np.ndarray) -> np.ndarray:
+    """Compute the standard errors of linear combinations of the model parameters. If the covariance matrix is not
+    finite (e.g. the model has no residual degrees of freedom), every standard error is NaN.
+
+    :param rows: A (k, p) array whose rows are the coefficients of each combination of the p parameters.
+    :param cov: The covariance matrix of the model parameters.
+
+    :return: The k standard errors.
+    """
+    if not np.isfinite(cov).all():
+        return np.full(len(rows), np.nan)
+    return np.sqrt(np.einsum("ij,jk,ik->i", rows, cov, rows))
+
+
+def _contrast(params: np.ndarray, cov: np.ndarray, contrast: np.ndarray) -> tuple[float, float]:
+    """Compute the value of a linear contrast of the model parameters and its standard error.
+
+    :param params: The fitted model parameters.
+    :param cov: The covariance matrix of the model parameters.
+    :param contrast: The contrast vector, i.e. the difference between the treated and control individuals.
+
+    :return: The effect and its standard error.
+    """
+    effect = contrast @ params
+    se = _standard_errors(contrast[np.newaxis], cov)[0]
+    return effect, se
+
+
 class LinearRegressionEstimator(RegressionEstimator):
     """A Linear Regression Estimator is a parametric estimator which restricts the variables in the data to a linear
     combination of parameters and functions of the variables (note these functions need not be linear).
@@ -48,8 +81,14 @@ class LinearRegressionEstimator(RegressionEstimator):
             alpha,
             query,
         )
-        for term in self.effect_modifiers:
-            self.adjustment_set.add(term)
+        if self.effect_modifiers:
+            self.adjustment_set = set(self.adjustment_set) | set(self.effect_modifiers)
+        # Store the factor names rather than the ModelDesc itself, as patsy objects cannot be (deep)copied
+        self._treatment_factors = tuple(
+            factor.name() for factor in ModelDesc.from_formula(self.treatment).rhs_termlist[1].factors
+        )
+        # Derived column names, each stored with the data frame or model it was derived from
+        self._column_cache = {}
 
     def gp_formula(
         self,
@@ -91,6 +130,45 @@ class LinearRegressionEstimator(RegressionEstimator):
         formula = gp.run_gp(ngen=ngen, pop_size=pop_size, num_offspring=num_offspring, seeds=seeds)
         formula = gp.simplify(formula)
         self.formula = f"{self.outcome} ~ I({formula}) - 1"
+        self.model = None
+
+    def _fit(self, data: pd.DataFrame) -> RegressionResultsWrapper:
+        """Fit the OLS model by solving the normal equations directly with a Cholesky decomposition, rather than
+        statsmodels' default SVD-based pseudoinverse. If the design matrix is rank deficient or too ill-conditioned for
+        the normal equations to be accurate, we fall back to a least squares solve with a pivoted QR decomposition.
+        The solution is wrapped in the usual statsmodels results object, so the fitted model supports the full
+        statsmodels API.
+
+        :param data: The data to fit to.
+
+        :return: The fitted model.
+        """
+        model = self.regressor(formula=self.formula, data=data)
+        x, y = model.wexog, model.wendog
+        n_params = x.shape[1]
+
+        # Only the lower triangle of X^T X is computed and read
+        xtx = dsyrk(1.0, x, trans=1, lower=1)
+        try:
+            factor = scipy.linalg.cho_factor(xtx, lower=True, check_finite=False)
+            diagonal = np.abs(np.diag(factor[0]))
+            # The condition number of X^T X is the square of that of X, so give up on the normal equations well before
+            # X itself becomes singular
+            if diagonal.min() <= diagonal.max() * np.finfo(float).eps ** 0.25:
+                raise np.linalg.LinAlgError("Design matrix is too ill-conditioned for the normal equations")
+            params = scipy.linalg.cho_solve(factor, x.T @ y, check_finite=False)
+            normalized_cov_params = scipy.linalg.cho_solve(factor, np.eye(n_params), check_finite=False)
+            rank = n_params
+        except np.linalg.LinAlgError:
+            params, _, rank, _ = scipy.linalg.lstsq(x, y, lapack_driver="gelsy", check_finite=False)
+            xtx = x.T @ x
+            normalized_cov_params = np.linalg.inv(xtx) if rank == n_params else np.linalg.pinv(xtx)
+
+        model.rank = rank
+        model.normalized_cov_params = normalized_cov_params
+        model.df_model = float(rank - model.k_constant)
+        model.df_resid = model.nobs - rank
+        return RegressionResultsWrapper(OLSResults(model, params, normalized_cov_params=normalized_cov_params))
 
     def estimate_coefficient(self) -> tuple[pd.Series, list[pd.Series, pd.Series]]:
         """Estimate the unit average treatment effect of the treatment on the outcome. That is, the change in outcome
@@ -100,20 +178,7 @@ class LinearRegressionEstimator(RegressionEstimator):
         """
         model = self._run_regression()
         newline = "\n"
-        patsy_md = ModelDesc.from_formula(self.treatment)
-
-        if any(
-            (
-                self.df.dtypes[factor.name()] == "object"
-                for factor in patsy_md.rhs_termlist[1].factors
-                # We want to remove this long term as it prevents us from discovering categoricals within I(...) blocks
-                if factor.name() in self.df.dtypes
-            )
-        ):
-            design_info = dmatrix(self.formula.split("~")[1], self.df).design_info
-            treatment = design_info.column_names[design_info.term_name_slices[self.treatment]]
-        else:
-            treatment = [self.treatment]
+        treatment = self._treatment_columns(model)
         assert set(treatment).issubset(
             model.params.index.tolist()
         ), f"{treatment} not in\n{'  ' + str(model.params.index).replace(newline, newline + '  ')}"
@@ -129,32 +194,46 @@ class LinearRegressionEstimator(RegressionEstimator):
         """
         model = self._run_regression()
 
-        # Create an empty individual for the control and treated
-        individuals = pd.DataFrame(1, index=["control", "treated"], columns=model.params.index)
-
-        # For Pandas version > 2, we need to explicitly state that the dataframe takes floating-point values
-        individuals = individuals.astype(float)
-
-        # It is ABSOLUTELY CRITICAL that these go last, otherwise we can't index
-        # the effect with "ate = t_test_results.effect[0]"
-        individuals.loc["control", [self.treatment]] = self.control_value
-        individuals.loc["treated", [self.treatment]] = self.treatment_value
+        # Create an individual for the control (row 0) and treated (row 1)
+        individuals = np.ones((2, len(model.params)))
+        treatment_index = model.params.index.get_loc(self.treatment)
+        individuals[0, treatment_index] = self.control_value
+        individuals[1, treatment_index] = self.treatment_value
 
         # Perform a t-test to compare the predicted outcome of the control and treated individual (ATE)
-        t_test_results = model.t_test(individuals.loc["treated"] - individuals.loc["control"])
-        ate = pd.Series(t_test_results.effect[0])
-        confidence_intervals = list(t_test_results.conf_int(alpha=self.alpha).flatten())
-        confidence_intervals = [pd.Series(interval) for interval in confidence_intervals]
+        effect, se = _contrast(model.params.to_numpy(), model.cov_params().to_numpy(), individuals[1] - individuals[0])
+        t_crit = self._t_critical(model)
+        ate = pd.Series(effect)
+        confidence_intervals = [pd.Series(effect - t_crit * se), pd.Series(effect + t_crit * se)]
         return ate, confidence_intervals
 
+    def estimate_ate_batch(self, pairs: np.ndarray) -> np.ndarray:
+        """Estimate the average treatment effect for several pairs of control and treatment values at once. The model
+        is fitted once and the effects and confidence intervals of every pair are computed together, rather than
+        calling `estimate_ate` once per pair.
+
+        :param pairs: A (k, 2) array of (control_value, treatment_value) pairs.
+
+        :return: A (k, 3) array whose columns are the average treatment effect and the lower and upper bounds of its
+                 confidence interval.
+        """
+        model = self._run_regression()
+        pairs = np.asarray(pairs, dtype=float)
+
+        contrasts = np.zeros((len(pairs), len(model.params)))
+        contrasts[:, model.params.index.get_loc(self.treatment)] = pairs[:, 1] - pairs[:, 0]
+        effects = contrasts @ model.params.to_numpy()
+        ses = _standard_errors(contrasts, model.cov_params().to_numpy())
+        t_crit = self._t_critical(model)
+        return np.column_stack([effects, effects - t_crit * ses, effects + t_crit * ses])
+
     def estimate_risk_ratio(self, adjustment_config: dict = None) -> tuple[pd.Series, list[pd.Series, pd.Series]]:
         """Estimate the risk_ratio effect of the treatment on the outcome. That is, the change in outcome caused
         by changing the treatment variable from the control value to the treatment value.
 
         :return: The average treatment effect and the 95% Wald confidence intervals.
         """
-        prediction = self._predict(adjustment_config=adjustment_config)
-        control_outcome, treatment_outcome = prediction.iloc[1], prediction.iloc[0]
+        control_outcome, treatment_outcome = self._predict_outcomes(adjustment_config)
         ci_low = pd.Series(treatment_outcome["mean_ci_lower"] / control_outcome["mean_ci_upper"])
         ci_high = pd.Series(treatment_outcome["mean_ci_upper"] / control_outcome["mean_ci_lower"])
         return pd.Series(treatment_outcome["mean"] / control_outcome["mean"]), [ci_low, ci_high]
@@ -171,12 +250,89 @@ class LinearRegressionEstimator(RegressionEstimator):
 
         :return: The average treatment effect and the 95% Wald confidence intervals.
         """
-        prediction = self._predict(adjustment_config=adjustment_config)
-        control_outcome, treatment_outcome = prediction.iloc[1], prediction.iloc[0]
+        control_outcome, treatment_outcome = self._predict_outcomes(adjustment_config)
         ci_low = pd.Series(treatment_outcome["mean_ci_lower"] - control_outcome["mean_ci_upper"])
         ci_high = pd.Series(treatment_outcome["mean_ci_upper"] - control_outcome["mean_ci_lower"])
         return pd.Series(treatment_outcome["mean"] - control_outcome["mean"]), [ci_low, ci_high]
 
+    def _predict_outcomes(self, adjustment_config: dict = None) -> tuple[pd.Series, pd.Series]:
+        """Estimate the outcomes under control and treatment.
+
+        :param: adjustment_config: The values of the adjustment variables to use.
+
+        :return: The estimated outcomes under control and treatment, each with keys "mean", "mean_ci_lower", and
+                 "mean_ci_upper".
+        """
+        prediction = self._predict(adjustment_config=adjustment_config)
+        return prediction.iloc[1], prediction.iloc[0]
+
+    def _predict_with_ci(self, model: RegressionResultsWrapper, x: pd.DataFrame) -> pd.DataFrame:
+        """Predict the mean outcome, with confidence intervals, for each individual. For a linear model, this is
+        computed directly from the parameters and their covariance, rather than via statsmodels' `get_prediction`,
+        which also computes observation intervals that we do not need.
+
+        :param model: The fitted model.
+        :param x: The variable values of the individuals to predict the outcome of.
+
+        :return: The predicted outcomes in the form of a dataframe with columns "mean", "mean_ci_lower", and
+                 "mean_ci_upper".
+        """
+        # Reuse the design info of the fitted model rather than re-parsing the formula. This also ensures that
+        # stateful transforms (e.g. splines, centring) and categorical levels are taken from the fitted data. The
+        # columns are in the same order as the model parameters, so a plain array is all we need.
+        design = np.asarray(dmatrix(model.model.data.design_info, x))
+        mean = design @ model.params.to_numpy()
+        se = _standard_errors(design, model.cov_params().to_numpy())
+        # Like statsmodels' summary_frame with its default arguments, the intervals are at the 95% level
+        t_crit = self._t_critical(model, alpha=0.05)
+        return pd.DataFrame(
+            {"mean": mean, "mean_ci_lower": mean - t_crit * se, "mean_ci_upper": mean + t_crit * se}, index=x.index
+        )
+
+    def _t_critical(self, model: RegressionResultsWrapper, alpha: float = None) -> float:
+        """Get the critical value of the Student's t distribution for two-sided confidence intervals. This is the same
+        value statsmodels uses in `t_test` and `conf_int`, without building the intermediate results objects.
+
+        :param model: The fitted model.
+        :param alpha: The significance level of the intervals, defaults to `self.alpha`.
+
+        :return: The critical value.
+        """
+        if alpha is None:
+            alpha = self.alpha
+        return stats.t.ppf(1 - alpha / 2, model.df_resid)
+
+    def _treatment_columns(self, model: RegressionResultsWrapper) -> list[str]:
+        """Get the names of the model parameters which correspond to the treatment. For categorical treatments, there
+        is one parameter per non-reference level. These are cached until the model is refitted.
+
+        :param model: The fitted model.
+
+        :return: The names of the treatment parameters.
+        """
+        cached_model, treatment_cols = self._column_cache.get("treatment", (None, None))
+        if cached_model is not model:
+            object_cols = self._object_columns()
+            # We want to remove this long term as it prevents us from discovering categoricals within I(...) blocks
+            if any(factor in object_cols for factor in self._treatment_factors):
+                design_info = model.model.data.design_info
+                treatment_cols = design_info.column_names[design_info.term_name_slices[self.treatment]]
+            else:
+                treatment_cols = [self.treatment]
+            self._column_cache["treatment"] = (model, treatment_cols)
+        return treatment_cols
+
+    def _object_columns(self) -> frozenset:
+        """Get the names of the object-dtype columns of the data. These are cached until `self.df` is replaced.
+
+        :return: The names of the object-dtype columns.
+        """
+        cached_df, object_cols = self._column_cache.get("object", (None, None))
+        if cached_df is not self.df:
+            object_cols = frozenset(self.df.select_dtypes(include="object").columns)
+            self._column_cache["object"] = (self.df, object_cols)
+        return object_cols
+
     def _get_confidence_intervals(self, model, treatment):
         confidence_intervals = model.conf_int(alpha=self.alpha, cols=None)
         ci_low, ci_high = (
@@ -0,0 +1,192 @@
+"""This module contains the graph algorithms and dot file parsing used by the CausalDAG class."""
+
+import re
+from functools import lru_cache
+from itertools import count
+from typing import Union
+
+import networkx as nx
+import numpy as np
+import pydot
+
+Node = Union[str, int]  # Node type hint: A node is a string or an int
+
+_GRAPH_VERSIONS = count()  # Version numbers identifying the state of each graph, see graph_version
+
+_DOT_KEYWORD = r"(?!(?i:node|edge|graph|digraph|subgraph|strict)\b)"
+_DOT_PLAIN_ID = rf"{_DOT_KEYWORD}[A-Za-z_]\w*"
+_DOT_ID = rf'(?:{_DOT_PLAIN_ID}|"{_DOT_KEYWORD}[\w .]+")'
+_DOT_GRAPH = re.compile(rf"\s*digraph\s+({_DOT_ID})\s*\{{(.*)\}}\s*", re.DOTALL)
+_DOT_EDGES = re.compile(rf"{_DOT_ID}(?:\s*->\s*{_DOT_ID})+")
+_DOT_ATTRIBUTE = re.compile(rf"({_DOT_PLAIN_ID})\s*=\s*({_DOT_PLAIN_ID}|\d+)")
+
+
+def parse_simple_dot(dot_content: str) -> Union[nx.DiGraph, None]:
+    """Parse a dot file containing nothing but plain node statements, edge statements, and graph attributes.
+
+    These cover most causal DAG specifications, and parsing them directly is much faster than going through pydot. The
+    resulting graph is the same as the one produced via pydot, including the order of its nodes and edges.
+
+    :param dot_content: The contents of the dot file.
+    :return: The graph, or None if the file uses any other dot syntax and so needs to be parsed by pydot.
+    """
+    match = _DOT_GRAPH.fullmatch(dot_content)
+    if match is None:
+        return None
+    statements = [statement.strip() for statement in match.group(2).split(";")]
+    if statements[-1] == "":
+        statements.pop()
+
+    nodes, edges, attributes = [], [], {}
+    for statement in statements:
+        if _DOT_EDGES.fullmatch(statement):
+            chain = [node.strip().strip('"') for node in statement.split("->")]
+            edges.extend(zip(chain, chain[1:]))
+        elif re.fullmatch(_DOT_ID, statement):
+            nodes.append(statement.strip('"'))
+        elif attribute := _DOT_ATTRIBUTE.fullmatch(statement):
+            attributes[attribute.group(1)] = attribute.group(2)
+        else:
+            return None
+
+    # Like networkx's from_pydot, add explicitly declared nodes before the nodes of each edge
+    graph = nx.DiGraph(name=match.group(1).strip('"'))
+    if attributes:
+        graph.graph["graph"] = attributes
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    return graph
+
+
+@lru_cache(maxsize=32)
+def read_dot_file(dot_path: str, modified: int, size: int) -> nx.DiGraph:  # pylint: disable=unused-argument
+    """Read the graph from a dot file. This is cached on the modification time and size of the file as well as its
+    path, so repeatedly loading an unchanged file only parses it once. The cached graph is shared, so must be copied
+    before being modified.
+
+    :param dot_path: The absolute path of the dot file.
+    :param modified: The modification time of the file in nanoseconds.
+    :param size: The size of the file in bytes.
+    :return: The graph.
+    """
+    with open(dot_path, "r", encoding="utf-8") as file:
+        dot_content = file.read().replace("\n", "")
+    # Previously, we used pydot_graph_from_file() to read in the dot_path directly, however,
+    # this method does not currently have a way of removing spurious nodes.
+    # Workaround: Read in the file using open(), remove new lines, and then create the pydot_graph.
+    graph = parse_simple_dot(dot_content)
+    if graph is None:
+        pydot_graph = pydot.graph_from_dot_data(dot_content)
+        graph = nx.DiGraph(nx.drawing.nx_pydot.from_pydot(pydot_graph[0]))
+    return graph
+
+
+def graph_version(graph: nx.DiGraph) -> Union[int, None]:
+    """Get a version number identifying the current state of a graph, against which cached results can be checked.
+    Edits can be made through any networkx method, so the version number is kept in the graph's networkx cache, which
+    networkx empties on every change to the nodes or edges, and a new one is drawn whenever it is gone.
+
+    :param graph: The graph.
+    :return: A version number unique to the current state of the graph, or None if changes to the graph cannot be
+    detected (e.g. it is a view of another graph), in which case nothing computed from it should be reused.
+    """
+    cache = getattr(graph, "__networkx_cache__", None)
+    if not isinstance(cache, dict) or nx.is_frozen(graph):
+        return None
+    if "causal_dag_version" not in cache:
+        cache["causal_dag_version"] = next(_GRAPH_VERSIONS)
+    return cache["causal_dag_version"]
+
+
+def topological_rank(graph: nx.DiGraph) -> Union[dict[Node, int], None]:
+    """Rank the nodes of a graph in topological order.
+
+    :param graph: The graph.
+    :return: A dict mapping each node to its rank, or None if the graph is cyclic.
+    """
+    try:
+        return {node: i for i, node in enumerate(nx.topological_sort(graph))}
+    except nx.NetworkXUnfeasible:
+        return None
+
+
+def reorder(graph: nx.DiGraph, u_of_edge: Node, v_of_edge: Node, rank: dict[Node, int]):
+    """Update a topological ranking for a new edge u -> v where u is currently ranked after v, raising HasACycle if v
+    reaches u (Pearce and Kelly, A Dynamic Topological Sort Algorithm for Directed Acyclic Graphs, 2007). Only nodes
+    ranked between v and u can be affected, so both searches stop there.
+
+    :param graph: The graph, without the new edge.
+    :param u_of_edge: From node
+    :param v_of_edge: To node
+    :param rank: The topological ranking to update in place.
+    """
+    lower, upper = rank[v_of_edge], rank[u_of_edge]
+    forward = {v_of_edge}
+    stack = [v_of_edge]
+    while stack:
+        for child in graph.successors(stack.pop()):
+            if child == u_of_edge:
+                raise nx.HasACycle("Invalid Causal DAG: contains a cycle.")
+            if child not in forward and rank[child] < upper:
+                forward.add(child)
+                stack.append(child)
+    backward = {u_of_edge}
+    stack = [u_of_edge]
+    while stack:
+        for parent in graph.predecessors(stack.pop()):
+            if parent not in backward and rank[parent] > lower:
+                backward.add(parent)
+                stack.append(parent)
+    # Reuse the same ranks, giving the lowest ones to the nodes that must now come before v
+    affected = sorted(backward, key=rank.get) + sorted(forward, key=rank.get)
+    for node, new_rank in zip(affected, sorted(rank[node] for node in affected)):
+        rank[node] = new_rank
+
+
+def set_bits(mask: np.ndarray, indices: list[int]):
+    """Set the given bit positions in a bitset of 64-bit words in place.
+
+    :param mask: A one-dimensional array of unsigned 64-bit words.
+    :param indices: The positions of the bits to set.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    np.bitwise_or.at(mask, indices // 64, np.left_shift(np.uint64(1), (indices % 64).astype("<u8")))
+
+
+def reachability_bits(graph: nx.DiGraph, rank: Union[dict[Node, int], None]) -> dict:
+    """Get the ancestors and descendants of every node of a graph as bitsets.
+
+    Each node is given an integer index, and the ancestors (or descendants) of a node, including itself, are stored
+    as a row of 64-bit words with one bit per node. Rows are filled in a single pass over a topological order, so
+    unions and intersections of reachable sets become bitwise operations on small integer arrays.
+
+    :param graph: The graph.
+    :param rank: A topological ranking of the nodes of the graph, or None if the graph is cyclic.
+    :return: A dict containing the node list, the index of each node, and the "ancestors" and "descendants"
+    bitset arrays.
+    """
+    nodes = list(graph.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    positions = np.arange(len(nodes))
+    bits = {}
+    for direction in ("ancestors", "descendants"):
+        bits[direction] = np.zeros((len(nodes), (len(nodes) + 63) // 64), dtype="<u8")
+        bits[direction][positions, positions // 64] = np.left_shift(np.uint64(1), (positions % 64).astype("<u8"))
+
+    if rank is None:
+        # Cyclic graphs have no topological order, so fall back to one search per node
+        for node in nodes:
+            for direction, search in (("ancestors", nx.ancestors), ("descendants", nx.descendants)):
+                set_bits(bits[direction][index[node]], [index[other] for other in search(graph, node)])
+    else:
+        order = sorted(nodes, key=rank.get)
+        for node in order:
+            parents = [index[parent] for parent in graph.predecessors(node)]
+            if parents:
+                bits["ancestors"][index[node]] |= np.bitwise_or.reduce(bits["ancestors"][parents], axis=0)
+        for node in reversed(order):
+            children = [index[child] for child in graph.successors(node)]
+            if children:
+                bits["descendants"][index[node]] |= np.bitwise_or.reduce(bits["descendants"][children], axis=0)
+
+    return {"nodes": nodes, "index": index, **bits}
@@ -3,22 +3,25 @@
 from __future__ import annotations
 
 import logging
-from itertools import combinations
-from random import sample
+import os
+from collections import OrderedDict
+from copy import deepcopy
+from itertools import chain, combinations
 from typing import Union
 
 import networkx as nx
-import pydot
+import numpy as np
 
 from causal_testing.testing.base_test_case import BaseTestCase
 
+from ._graph_utils import Node, graph_version, reachability_bits, read_dot_file, reorder, set_bits, topological_rank
 from .scenario import Scenario
 from .variable import Output
 
-Node = Union[str, int]  # Node type hint: A node is a string or an int
-
 logger = logging.getLogger(__name__)
 
+_MEMO_SIZE = 128  # Number of identification results each causal DAG keeps, see CausalDAG._memoised
+
 
 def list_all_min_sep(
     graph: nx.Graph,
@@ -37,58 +40,88 @@ def list_all_min_sep(
     :param outcome_node: The node corresponding to the outcome variable we wish to separate from the input.
     :param treatment_node_set: Set of treatment nodes.
     :param outcome_node_set: Set of outcome nodes.
-    :return: A list of minimal-sized sets of variables which separate treatment and outcome in the undirected graph.
+    :return: A generator of minimal-sized sets of variables which separate treatment and outcome in the undirected
+    graph, as frozensets. The same separator can be reached along more than one branch, so callers should deduplicate.
     """
-    # 1. Compute the close separator of the treatment set
-    close_separator_set = close_separator(graph, treatment_node, outcome_node, treatment_node_set)
-
-    # 2. Use the close separator to separate the graph and obtain the connected components (connected sub-graphs)
-    components_graph = graph.copy()
-    components_graph.remove_nodes_from(close_separator_set)
-    graph_components = nx.connected_components(components_graph)
-
-    # 3. Find the connected component that contains the treatment node
-    treatment_connected_component_node_set = set()
-    for component in graph_components:
-        if treatment_node in component:
-            treatment_connected_component_node_set = component
-
-    # 4. Confirm that the connected component containing the treatment node is disjoint with the outcome node set
-    if not treatment_connected_component_node_set.intersection(outcome_node_set):
-        # 5. Update the treatment node set to the set of nodes in the connected component containing the treatment node
-        treatment_node_set = treatment_connected_component_node_set
+    adjacency = {node: set(neighbours) for node, neighbours in graph.adjacency()}
+
+    # Each frame of the stack is a (treatment node set, outcome node set) pair to be explored. The right branch is
+    # pushed before the left branch so that separators are produced in the same order as the recursive formulation.
+    stack = [(treatment_node_set, outcome_node_set)]
+    while stack:
+        treatment_node_set, outcome_node_set = stack.pop()
 
-        # 6. Obtain the neighbours of the new treatment node set (this excludes the treatment nodes themselves)
-        treatment_node_set_neighbours = (
-            set.union(*[set(nx.neighbors(graph, node)) for node in treatment_node_set]) - treatment_node_set
+        # 1. Compute the close separator of the treatment set
+        close_separator_set = _close_separator(adjacency, treatment_node, outcome_node, treatment_node_set)
+
+        # 2. Find the connected component containing the treatment node once the close separator is removed, giving up
+        # early if it contains any outcome node (the component would not be disjoint with the outcome node set)
+        treatment_connected_component_node_set = _connected_component(
+            adjacency, treatment_node, close_separator_set, outcome_node_set
         )
+        if treatment_connected_component_node_set is None:
+            continue
 
-        # 7. Check that there exists at least one neighbour of the treatment nodes that is not in the outcome node set
-        if treatment_node_set_neighbours.difference(outcome_node_set):
-            # 7.1. If so, sample a random node from the set of treatment nodes' neighbours not in the outcome node set
-            node = set(sample(sorted(treatment_node_set_neighbours.difference(outcome_node_set)), 1))
-
-            # 7.2. Add this node to the treatment node set and recurse (left branch)
-            yield from list_all_min_sep(
-                graph,
-                treatment_node,
-                outcome_node,
-                treatment_node_set.union(node),
-                outcome_node_set,
-            )
+        # 3. Update the treatment node set to the set of nodes in the connected component containing the treatment node
+        treatment_node_set = treatment_connected_component_node_set
 
-            # 7.3. Add this node to the outcome node set and recurse (right branch)
-            yield from list_all_min_sep(
-                graph,
-                treatment_node,
-                outcome_node,
-                treatment_node_set,
-                outcome_node_set.union(node),
-            )
+        # 4. Obtain the neighbours of the new treatment node set (this excludes the treatment nodes themselves)
+        treatment_node_set_neighbours = _neighbours_union(adjacency, treatment_node_set) - treatment_node_set
+
+        # 5. Check that there exists at least one neighbour of the treatment nodes that is not in the outcome node set
+        if treatment_node_set_neighbours.difference(outcome_node_set):
+            # 5.1. If so, pick one of the treatment nodes' neighbours not in the outcome node set. Any choice of node
+            # gives a correct result, so take the smallest to keep the output order stable between runs.
+            node = {min(treatment_node_set_neighbours.difference(outcome_node_set))}
+
+            # 5.2. Explore adding this node to the outcome node set (right branch) after adding it to the treatment node
+            # set (left branch)
+            stack.append((treatment_node_set, outcome_node_set.union(node)))
+            stack.append((treatment_node_set.union(node), outcome_node_set))
         else:
-            # 8. If all neighbours of the treatments nodes are in the outcome node set, return the set of treatment
+            # 6. If all neighbours of the treatments nodes are in the outcome node set, return the set of treatment
             # node neighbours
-            yield treatment_node_set_neighbours
+            yield frozenset(treatment_node_set_neighbours)
+
+
+def _neighbours_union(adjacency: dict[Node, set[Node]], nodes: set[Node]) -> set[Node]:
+    """Get the union of the neighbours of a collection of nodes in an undirected graph.
+
+    :param adjacency: The graph as a mapping from each node to its neighbours, e.g. an adjacency dict or graph.adj.
+    :param nodes: The nodes whose neighbours to collect.
+    :return: The set of nodes adjacent to any of the given nodes.
+    """
+    neighbours = set()
+    for node in nodes:
+        neighbours.update(adjacency[node])
+    return neighbours
+
+
+def _connected_component(
+    adjacency: dict[Node, set[Node]], start: Node, removed: set[Node], stop_nodes: set[Node]
+) -> Union[set[Node], None]:
+    """Find the connected component containing a node in an undirected graph once a set of nodes has been removed.
+
+    :param adjacency: The undirected graph as a dict mapping each node to the set of its neighbours.
+    :param start: The node whose connected component to find.
+    :param removed: The nodes to remove from the graph.
+    :param stop_nodes: If the component contains any of these nodes, stop searching.
+    :return: The connected component containing start, or None if it contains a node in stop_nodes.
+    """
+    if start in removed:
+        return set()
+    if start in stop_nodes:
+        return None
+    component = {start}
+    frontier = [start]
+    while frontier:
+        for neighbour in adjacency[frontier.pop()]:
+            if neighbour not in component and neighbour not in removed:
+                if neighbour in stop_nodes:
+                    return None
+                component.add(neighbour)
+                frontier.append(neighbour)
+    return component
 
 
 def close_separator(
@@ -109,18 +142,27 @@ def close_separator(
     :param treatment_node_set: The set of variables containing the treatment node ({treatment_node}).
     :return: A treatment_node-outcome_node separator whose vertices are adjacent to those in treatments.
     """
-    treatment_neighbours = set.union(*[set(nx.neighbors(graph, treatment)) for treatment in treatment_node_set])
-    components_graph = graph.copy()
-    components_graph.remove_nodes_from(treatment_neighbours)
-    graph_components = nx.connected_components(components_graph)
-    for component in graph_components:
-        if outcome_node in component:
-            neighbours_of_variables_in_component = set.union(
-                *[set(nx.neighbors(graph, variable)) for variable in component]
-            )
-            # For this algorithm, the neighbours of a node do not include the node itself
-            neighbours_of_variables_in_component = neighbours_of_variables_in_component.difference(component)
-            return neighbours_of_variables_in_component
+    adjacency = {node: set(neighbours) for node, neighbours in graph.adjacency()}
+    return _close_separator(adjacency, treatment_node, outcome_node, treatment_node_set)
+
+
+def _close_separator(
+    adjacency: dict[Node, set[Node]], treatment_node: Node, outcome_node: Node, treatment_node_set: set[Node]
+) -> set[Node]:
+    """Compute the close separator for a set of treatments in an undirected graph given as an adjacency dict. See
+    close_separator.
+
+    Only the component containing the outcome node is needed, so it is found with a single search from the outcome
+    node rather than by partitioning the whole graph.
+    """
+    treatment_neighbours = _neighbours_union(adjacency, treatment_node_set)
+    if outcome_node in adjacency:
+        component = _connected_component(adjacency, outcome_node, treatment_neighbours, set())
+    else:
+        component = set()
+    if component:
+        # For this algorithm, the neighbours of a node do not include the node itself
+        return _neighbours_union(adjacency, component) - component
     raise ValueError(f"No {treatment_node}-{outcome_node} separator in the graph.")
 
 
@@ -132,14 +174,20 @@ class CausalDAG(nx.DiGraph):
 
     def __init__(self, dot_path: str = None, ignore_cycles: bool = False, **attr):
         super().__init__(**attr)
+        # The topological rank of each node (maintained incrementally by add_edge), the ancestor and descendant bitsets
+        # of every node, and identification results, each stored with the _graph_key of the graph they were built for
+        self._topo_rank = {}
+        self._topo_key = None
+        self._reachability = {}
+        self._reachability_key = None
+        self._memo = OrderedDict()
+        self._memo_key = None
         if dot_path:
-            with open(dot_path, "r", encoding="utf-8") as file:
-                dot_content = file.read().replace("\n", "")
-            # Previously, we used pydot_graph_from_file() to read in the dot_path directly, however,
-            # this method does not currently have a way of removing spurious nodes.
-            # Workaround: Read in the file using open(), remove new lines, and then create the pydot_graph.
-            pydot_graph = pydot.graph_from_dot_data(dot_content)
-            self.graph = nx.DiGraph(nx.drawing.nx_pydot.from_pydot(pydot_graph[0]))
+            stat = os.stat(dot_path)
+            graph = read_dot_file(os.path.abspath(dot_path), stat.st_mtime_ns, stat.st_size)
+            # The node and edge attribute dicts are copied, but the graph attributes can be nested so need a deep copy
+            self.graph = graph.copy()
+            self.graph.graph = deepcopy(graph.graph)
         else:
             self.graph = nx.DiGraph()
 
@@ -159,7 +207,7 @@ class CausalDAG(nx.DiGraph):
         :return Boolean True if the three IV assumptions hold.
         """
         # (i) Instrument is associated with treatment
-        if nx.d_separated(self.graph, {instrument}, {treatment}, set()):
+        if self.d_separated([instrument], [treatment], []):
             raise ValueError(f"Instrument {instrument} is not associated with treatment {treatment} in the DAG")
 
         # (ii) Instrument does not affect outcome except through its potential effect on treatment
@@ -185,15 +233,167 @@ class CausalDAG(nx.DiGraph):
     def add_edge(self, u_of_edge: Node, v_of_edge: Node, **attr):
         """Add an edge to the causal DAG.
 
-        Overrides the default networkx method to prevent users from adding a cycle.
+        Overrides the default networkx method to prevent users from adding a cycle. The check is made before the graph
+        is modified, so a rejected edge is never added. A topological ranking of the nodes is maintained between calls
+        (Pearce and Kelly, A Dynamic Topological Sort Algorithm for Directed Acyclic Graphs, 2007), so an edge that
+        agrees with the current order is accepted without searching the graph, and any other edge only searches the
+        nodes ranked between its endpoints.
         :param u_of_edge: From node
         :param v_of_edge: To node
         :param attr: Attributes
         """
+        if self._graph_key() is None:
+            # The cached order cannot be shown to be current, so check the whole graph once the edge is added instead
+            new_edge = not self.graph.has_edge(u_of_edge, v_of_edge)
+            self.graph.add_edge(u_of_edge, v_of_edge, **attr)
+            if not nx.is_directed_acyclic_graph(self.graph):
+                if new_edge:
+                    self.graph.remove_edge(u_of_edge, v_of_edge)
+                raise nx.HasACycle("Invalid Causal DAG: contains a cycle.")
+            return
+
+        rank = self._topological_rank()
+        if rank is None:
+            # The graph already contains a cycle (see ignore_cycles), so there is no order to maintain
+            if u_of_edge in self.graph and v_of_edge in self.graph and nx.has_path(self.graph, v_of_edge, u_of_edge):
+                raise nx.HasACycle("Invalid Causal DAG: contains a cycle.")
+            self.graph.add_edge(u_of_edge, v_of_edge, **attr)
+            return
+
+        if u_of_edge == v_of_edge:
+            raise nx.HasACycle("Invalid Causal DAG: contains a cycle.")
+        # A new source can go before every other node and a new sink after every other node
+        if u_of_edge not in rank:
+            rank[u_of_edge] = min(rank.values(), default=0) - 1
+        if v_of_edge not in rank:
+            rank[v_of_edge] = max(rank.values(), default=0) + 1
+        if rank[u_of_edge] > rank[v_of_edge]:
+            reorder(self.graph, u_of_edge, v_of_edge, rank)
+
         self.graph.add_edge(u_of_edge, v_of_edge, **attr)
+        self._topo_key = self._graph_key()
+
+    def add_edges_from_safe(self, edges: list[tuple]):
+        """Add a collection of edges to the causal DAG, checking for cycles once after all of them have been added.
+
+        add_edge is intended for adding edges one at a time, whereas this is the equivalent for building up a DAG in
+        bulk, costing a single acyclicity check. If the edges would create a cycle, the causal DAG is left unchanged.
+        :param edges: An iterable of (u, v) or (u, v, attr) edges, as accepted by networkx's add_edges_from.
+        """
+        edges = list(edges)
+        new_nodes = {node for edge in edges for node in edge[:2] if node not in self.graph}
+        new_edges = {tuple(edge[:2]) for edge in edges if not self.graph.has_edge(*edge[:2])}
+        self.graph.add_edges_from(edges)
         if not self.is_acyclic():
+            self.graph.remove_edges_from(new_edges)
+            self.graph.remove_nodes_from(new_nodes)
             raise nx.HasACycle("Invalid Causal DAG: contains a cycle.")
 
+    def _graph_key(self) -> Union[int, None]:
+        """Get a key identifying the current state of the graph, against which cached results are checked. See
+        graph_version.
+        """
+        return graph_version(self.graph)
+
+    def _memoised(self, name: str, treatments: list[str], outcomes: list[str], compute):
+        """Get the result of compute(treatments, outcomes), reusing the result of an earlier call with the same sets of
+        treatments and outcomes if the graph has not changed since. Only the most recently used results are kept.
+
+        :param name: A label for the quantity being computed.
+        :param treatments: A list of treatment variables.
+        :param outcomes: A list of outcome variables.
+        :param compute: A function of the treatments and outcomes which computes the quantity.
+        :return: The (possibly cached) result of compute. This is shared between calls, so must not be modified.
+        """
+        key = self._graph_key()
+        if key is None:
+            return compute(treatments, outcomes)
+        if self._memo_key != key:
+            self._memo = OrderedDict()
+            self._memo_key = key
+        memo_key = (name, frozenset(treatments), frozenset(outcomes))
+        if memo_key in self._memo:
+            self._memo.move_to_end(memo_key)
+        else:
+            self._memo[memo_key] = compute(treatments, outcomes)
+            if len(self._memo) > _MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return self._memo[memo_key]
+
+    def _reachability_bits(self) -> dict:
+        """Get the ancestors and descendants of every node as bitsets, building them if the graph has changed. See
+        reachability_bits.
+
+        :return: A dict containing the node list, the index of each node, and the "ancestors" and "descendants"
+        bitset arrays.
+        """
+        key = self._graph_key()
+        if key is None or self._reachability_key != key:
+            self._reachability = reachability_bits(self.graph, self._topological_rank())
+            self._reachability_key = key
+        return self._reachability
+
+    def _nodes_mask(self, nodes: list[Node]) -> np.ndarray:
+        """Get the bitset of a collection of nodes."""
+        mask = np.zeros(self._reachability_bits()["ancestors"].shape[1], dtype="<u8")
+        set_bits(mask, [self._node_index(node) for node in nodes])
+        return mask
+
+    def _reachable_mask(self, nodes: list[Node], direction: str) -> np.ndarray:
+        """Get the bitset of the ancestors or descendants of a collection of nodes, including the nodes themselves.
+
+        :param nodes: The nodes to start from.
+        :param direction: Either "ancestors" or "descendants".
+        :return: The union of the reachable sets of the given nodes as a bitset.
+        """
+        rows = [self._node_index(node) for node in nodes]
+        return np.bitwise_or.reduce(self._reachability_bits()[direction][rows], axis=0)
+
+    def _reachable(self, nodes: list[Node], direction: str) -> set[Node]:
+        """Get the union of the ancestors or descendants of a collection of nodes, including the nodes themselves.
+
+        :param nodes: The nodes to start from.
+        :param direction: Either "ancestors" or "descendants".
+        :return: The set of nodes reachable from (or reaching) any of the given nodes.
+        """
+        return self._decode_mask(self._reachable_mask(nodes, direction))
+
+    def is_ancestor(self, ancestor: Node, node: Node) -> bool:
+        """Check whether there is a directed path from one node to another.
+
+        Reachability is computed for the whole graph on first use, so checking many pairs of nodes costs one pass over
+        the graph rather than one search per pair.
+
+        :param ancestor: The node to check is an ancestor.
+        :param node: The node whose ancestors to check.
+        :return: True if ancestor is an ancestor of node, False otherwise. A node is not its own ancestor.
+        """
+        i, j = self._node_index(node), self._node_index(ancestor)
+        return i != j and bool(self._reachability_bits()["ancestors"][i, j // 64] & np.uint64(1 << (j % 64)))
+
+    def _decode_mask(self, mask: np.ndarray) -> set[Node]:
+        """Convert a bitset back into a set of nodes."""
+        nodes = self._reachability_bits()["nodes"]
+        flags = np.unpackbits(mask.view(np.uint8), bitorder="little")[: len(nodes)]
+        return {nodes[i] for i in np.flatnonzero(flags)}
+
+    def _node_index(self, node: Node) -> int:
+        index = self._reachability_bits()["index"]
+        if node not in index:
+            raise nx.NetworkXError(f"The node {node} is not in the digraph.")
+        return index[node]
+
+    def _topological_rank(self) -> Union[dict, None]:
+        """Get the cached topological rank of each node, rebuilding it if the graph has changed since it was computed.
+
+        :return: A dict mapping each node to its rank, or None if the graph is cyclic.
+        """
+        key = self._graph_key()
+        if key is None or self._topo_key != key:
+            self._topo_rank = topological_rank(self.graph)
+            self._topo_key = key
+        return self._topo_rank
+
     def cycle_nodes(self) -> list:
         """Get the nodes involved in any cycles.
         :return: A list containing all nodes involved in a cycle.
@@ -205,7 +405,7 @@ class CausalDAG(nx.DiGraph):
 
         :return: True if acyclic, False otherwise.
         """
-        return not self.cycle_nodes()
+        return nx.is_directed_acyclic_graph(self.graph)
 
     def get_proper_backdoor_graph(self, treatments: list[str], outcomes: list[str]) -> CausalDAG:
         """Convert the causal DAG to a proper back-door graph.
@@ -247,16 +447,9 @@ class CausalDAG(nx.DiGraph):
         :param outcomes: A list of outcome variables to include in the ancestral graph (and their ancestors).
         :return: An ancestral graph relative to the set of variables X union Y.
         """
-        ancestor_graph = self.copy()
-        treatment_ancestors = set.union(
-            *[nx.ancestors(ancestor_graph.graph, treatment).union({treatment}) for treatment in treatments]
-        )
-        outcome_ancestors = set.union(
-            *[nx.ancestors(ancestor_graph.graph, outcome).union({outcome}) for outcome in outcomes]
-        )
-        variables_to_keep = treatment_ancestors.union(outcome_ancestors)
-        variables_to_remove = set(self.graph.nodes).difference(variables_to_keep)
-        ancestor_graph.graph.remove_nodes_from(variables_to_remove)
+        variables_to_keep = self._reachable(treatments, "ancestors") | self._reachable(outcomes, "ancestors")
+        ancestor_graph = CausalDAG()
+        ancestor_graph.graph = self.graph.subgraph(variables_to_keep).copy()
         return ancestor_graph
 
     def get_indirect_graph(self, treatments: list[str], outcomes: list[str]) -> CausalDAG:
@@ -269,15 +462,16 @@ class CausalDAG(nx.DiGraph):
         :return: The indirect graph with edges pointing from X to Y removed.
         :rtype: CausalDAG
         """
-        gback = self.copy()
-        ee = []
-        for s in treatments:
-            for t in outcomes:
-                if (s, t) in gback.graph.edges:
-                    ee.append((s, t))
-        for v1, v2 in ee:
-            gback.graph.remove_edge(v1, v2)
-        return gback
+        indirect_graph = CausalDAG()
+        indirect_graph.graph = self._indirect_view(treatments, outcomes).copy()
+        return indirect_graph
+
+    def _indirect_view(self, treatments: list[str], outcomes: list[str]) -> nx.DiGraph:
+        """Get the indirect graph as a read-only view of the causal DAG's graph rather than a copy. See
+        get_indirect_graph.
+        """
+        edges_to_remove = [(s, t) for s in treatments for t in outcomes if self.graph.has_edge(s, t)]
+        return nx.restricted_view(self.graph, [], edges_to_remove)
 
     def direct_effect_adjustment_sets(
         self, treatments: list[str], outcomes: list[str], nodes_to_ignore: list[str] = None
@@ -303,18 +497,10 @@ class CausalDAG(nx.DiGraph):
         if nodes_to_ignore is None:
             nodes_to_ignore = []
 
-        indirect_graph = self.get_indirect_graph(treatments, outcomes)
-        ancestor_graph = indirect_graph.get_ancestor_graph(treatments, outcomes)
-        gam = nx.moral_graph(ancestor_graph.graph)
-
-        edges_to_add = [("TREATMENT", treatment) for treatment in treatments]
-        edges_to_add += [("OUTCOME", outcome) for outcome in outcomes]
-        gam.add_edges_from(edges_to_add)
-
-        min_seps = list(list_all_min_sep(gam, "TREATMENT", "OUTCOME", set(treatments), set(outcomes)))
-        if set(outcomes) in min_seps:
-            min_seps.remove(set(outcomes))
-        return sorted(list(filter(lambda sep: not sep.intersection(nodes_to_ignore), min_seps)))
+        gam = self._separator_graph("direct", treatments, outcomes)
+        min_seps = dict.fromkeys(list_all_min_sep(gam, "TREATMENT", "OUTCOME", set(treatments), set(outcomes)))
+        min_seps.pop(frozenset(outcomes), None)
+        return sorted(set(sep) for sep in min_seps if not sep.intersection(nodes_to_ignore))
 
     def enumerate_minimal_adjustment_sets(self, treatments: list[str], outcomes: list[str]) -> list[set[str]]:
         """Get the smallest possible set of variables that blocks all back-door paths between all pairs of treatments
@@ -337,31 +523,17 @@ class CausalDAG(nx.DiGraph):
         :return: A list of strings representing the minimal adjustment set.
         """
 
-        # 1. Construct the proper back-door graph's ancestor moral graph
-        proper_backdoor_graph = self.get_proper_backdoor_graph(treatments, outcomes)
-        ancestor_proper_backdoor_graph = proper_backdoor_graph.get_ancestor_graph(treatments, outcomes)
-        moralised_proper_backdoor_graph = nx.moral_graph(ancestor_proper_backdoor_graph.graph)
-
-        # 2. Add an edge X^m to treatment nodes and Y^m to outcome nodes
-        edges_to_add = [("TREATMENT", treatment) for treatment in treatments]
-        edges_to_add += [("OUTCOME", outcome) for outcome in outcomes]
-        moralised_proper_backdoor_graph.add_edges_from(edges_to_add)
-
-        # 3. Remove treatment and outcome nodes from graph and connect neighbours
-        treatment_neighbours = set.union(
-            *[set(nx.neighbors(moralised_proper_backdoor_graph, treatment)) for treatment in treatments]
-        ) - set(treatments)
-        outcome_neighbours = set.union(
-            *[set(nx.neighbors(moralised_proper_backdoor_graph, outcome)) for outcome in outcomes]
-        ) - set(outcomes)
-
-        neighbour_edges_to_add = list(combinations(treatment_neighbours, 2)) + list(combinations(outcome_neighbours, 2))
-        moralised_proper_backdoor_graph.add_edges_from(neighbour_edges_to_add)
+        # 1-3. Construct the proper back-door graph's ancestor moral graph, with X^m and Y^m attached
+        proper_backdoor_graph = self._memoised(
+            "proper_backdoor_graph", treatments, outcomes, self.get_proper_backdoor_graph
+        )
+        moralised_proper_backdoor_graph = self._separator_graph("total", treatments, outcomes)
 
         # 4.  Find all minimal separators of X^m and Y^m using Takata's algorithm for listing minimal separators
         treatment_node_set = {"TREATMENT"}
         outcome_node_set = set(nx.neighbors(moralised_proper_backdoor_graph, "OUTCOME")).union({"OUTCOME"})
-        minimum_adjustment_sets = list(
+        # dict.fromkeys removes duplicate separators while keeping the order in which they were found
+        minimum_adjustment_sets = dict.fromkeys(
             list_all_min_sep(
                 moralised_proper_backdoor_graph,
                 "TREATMENT",
@@ -371,13 +543,50 @@ class CausalDAG(nx.DiGraph):
             )
         )
         valid_minimum_adjustment_sets = [
-            adj
+            set(adj)
             for adj in minimum_adjustment_sets
             if self.constructive_backdoor_criterion(proper_backdoor_graph, treatments, outcomes, adj)
         ]
 
         return valid_minimum_adjustment_sets
 
+    def _separator_graph(self, effect: str, treatments: list[str], outcomes: list[str]) -> nx.Graph:
+        """Build the undirected graph whose minimal TREATMENT-OUTCOME separators are the candidate adjustment sets.
+
+        This is the moral graph of the ancestors of the treatments and outcomes in a reduced version of the causal DAG,
+        with a TREATMENT node attached to every treatment and an OUTCOME node attached to every outcome. For direct
+        effects the reduced graph is the indirect graph. For total effects it is the proper back-door graph, and the
+        neighbourhoods of the treatments and of the outcomes are also made into cliques.
+
+        :param effect: Either "direct" or "total".
+        :param treatments: A list of treatment variables.
+        :param outcomes: A list of outcome variables.
+        :return: The undirected graph to search for separators.
+        """
+        if effect == "direct":
+            indirect_graph = self._indirect_view(treatments, outcomes)
+            ancestors = set(treatments + outcomes).union(
+                *(nx.ancestors(indirect_graph, node) for node in treatments + outcomes)
+            )
+            ancestor_graph = indirect_graph.subgraph(ancestors)
+        else:
+            reduced_graph = self._memoised(
+                "proper_backdoor_graph", treatments, outcomes, self.get_proper_backdoor_graph
+            )
+            ancestor_graph = reduced_graph.get_ancestor_graph(treatments, outcomes).graph
+        separator_graph = nx.moral_graph(ancestor_graph)
+        separator_graph.add_edges_from([("TREATMENT", treatment) for treatment in treatments])
+        separator_graph.add_edges_from([("OUTCOME", outcome) for outcome in outcomes])
+
+        if effect == "total":
+            # Remove treatment and outcome nodes from graph and connect neighbours. Each neighbourhood becomes a clique
+            treatment_neighbours = _neighbours_union(separator_graph.adj, treatments) - set(treatments)
+            outcome_neighbours = _neighbours_union(separator_graph.adj, outcomes) - set(outcomes)
+            separator_graph.add_edges_from(
+                chain(combinations(treatment_neighbours, 2), combinations(outcome_neighbours, 2))
+            )
+        return separator_graph
+
     def adjustment_set_is_minimal(self, treatments: list[str], outcomes: list[str], adjustment_set: set[str]) -> bool:
         """Given a list of treatments X, a list of outcomes Y, and an adjustment set Z, determine whether Z is the
         smallest possible adjustment set.
@@ -393,21 +602,23 @@ class CausalDAG(nx.DiGraph):
         :param adjustment_set: Set of adjustment variables.
         :return: True or False depending on whether the adjustment set is minimal.
         """
-        proper_backdoor_graph = self.get_proper_backdoor_graph(treatments, outcomes)
+        proper_backdoor_graph = self._memoised(
+            "proper_backdoor_graph", treatments, outcomes, self.get_proper_backdoor_graph
+        )
 
         # Ensure that constructive back-door criterion is satisfied
         if not self.constructive_backdoor_criterion(proper_backdoor_graph, treatments, outcomes, adjustment_set):
             raise ValueError(f"{adjustment_set} is not a valid adjustment set.")
 
-        # Remove each variable one at a time and return false if constructive back-door criterion remains satisfied
+        # Remove each variable one at a time and return false if constructive back-door criterion remains satisfied.
+        # Condition (1) only forbids certain variables, so it holds for every subset of Z once it holds for Z and only
+        # condition (2) needs checking inside the loop.
         for variable in adjustment_set:
             smaller_adjustment_set = adjustment_set.copy()
             smaller_adjustment_set.remove(variable)
             if not smaller_adjustment_set:  # Treat None as the empty set
                 smaller_adjustment_set = set()
-            if self.constructive_backdoor_criterion(
-                proper_backdoor_graph, treatments, outcomes, smaller_adjustment_set
-            ):
+            if self._satisfies_condition_2(proper_backdoor_graph, treatments, outcomes, smaller_adjustment_set):
                 logger.info(
                     f"Z={adjustment_set} is not minimal because Z'=Z\\{variable} = {smaller_adjustment_set} is also a"
                     f"valid adjustment set.",
@@ -438,31 +649,45 @@ class CausalDAG(nx.DiGraph):
         :return: True or False, depending on whether the set of covariates satisfies the constructive back-door
         criterion.
         """
-        # Condition (1)
+        return self._satisfies_condition_1(treatments, outcomes, covariates) and self._satisfies_condition_2(
+            proper_backdoor_graph, treatments, outcomes, covariates
+        )
+
+    def _forbidden_covariates_mask(self, treatments: list[str], outcomes: list[str]) -> Union[np.ndarray, None]:
+        """Get the bitset of variables that are descendents of some variable on a proper causal path between the
+        treatments and outcomes, i.e. the variables that condition (1) of the constructive back-door criterion forbids.
+
+        :param treatments: A list of treatment variables.
+        :param outcomes: A list of outcome variables.
+        :return: The bitset of forbidden variables, or None if there are no proper causal paths.
+        """
         proper_causal_path_vars = self.proper_causal_pathway(treatments, outcomes)
-        if proper_causal_path_vars:
-            descendents_of_proper_casual_paths = set.union(
-                *[
-                    set.union(
-                        nx.descendants(self.graph, proper_causal_path_var),
-                        {proper_causal_path_var},
-                    )
-                    for proper_causal_path_var in proper_causal_path_vars
-                ]
+        if not proper_causal_path_vars:
+            return None
+        return self._reachable_mask(proper_causal_path_vars, "descendants")
+
+    def _satisfies_condition_1(self, treatments: list[str], outcomes: list[str], covariates: list[str]) -> bool:
+        """Check condition (1) of the constructive back-door criterion. See constructive_backdoor_criterion."""
+        forbidden = self._memoised("forbidden_covariates", treatments, outcomes, self._forbidden_covariates_mask)
+        if forbidden is not None and (
+            not set(covariates).issubset(self.graph.nodes) or (self._nodes_mask(covariates) & forbidden).any()
+        ):
+            logger.info(
+                "Failed Condition 1: Z=%s **is** a descendent of some variable on a proper causal "
+                "path between X=%s and Y=%s.",
+                covariates,
+                treatments,
+                outcomes,
             )
+            return False
+        return True
 
-            if not set(covariates).issubset(set(self.graph.nodes).difference(descendents_of_proper_casual_paths)):
-                logger.info(
-                    "Failed Condition 1: Z=%s **is** a descendent of some variable on a proper causal "
-                    "path between X=%s and Y=%s.",
-                    covariates,
-                    treatments,
-                    outcomes,
-                )
-                return False
-
-        # Condition (2)
-        if not nx.d_separated(proper_backdoor_graph.graph, set(treatments), set(outcomes), set(covariates)):
+    @staticmethod
+    def _satisfies_condition_2(
+        proper_backdoor_graph: CausalDAG, treatments: list[str], outcomes: list[str], covariates: list[str]
+    ) -> bool:
+        """Check condition (2) of the constructive back-door criterion. See constructive_backdoor_criterion."""
+        if not proper_backdoor_graph.d_separated(treatments, outcomes, covariates):
             logger.info(
                 "Failed Condition 2: Z=%s **does not** d-separate X=%s and Y=%s in"
                 " the proper back-door graph relative to X and Y.",
@@ -471,9 +696,57 @@ class CausalDAG(nx.DiGraph):
                 outcomes,
             )
             return False
+        return True
 
+    def d_separated(self, xs: list[Node], ys: list[Node], zs: list[Node]) -> bool:
+        """Check whether zs d-separates xs and ys in the causal DAG.
+
+        This is the case exactly when xs and ys are disconnected in the moral graph of the ancestors of xs, ys, and zs
+        once zs is removed (Lauritzen et al., Independence properties of directed Markov fields, 1990). The moral
+        ancestral graph of xs and ys is built once and reused for every zs among those ancestors, so checking many
+        candidate separators for the same xs and ys costs one search each.
+
+        :param xs: A list of nodes.
+        :param ys: A list of nodes disjoint from xs.
+        :param zs: A list of nodes disjoint from xs and ys.
+        :return: True if zs d-separates xs and ys, False otherwise.
+        """
+        xs, ys, zs = set(xs), set(ys), set(zs)
+        if xs & ys or xs & zs or ys & zs:
+            raise nx.NetworkXError("The sets are not disjoint")
+        adjacency = self._memoised("moral_ancestral_graph", xs, ys, lambda xs, ys: self._moral_ancestral_graph(xs | ys))
+        if not zs.issubset(adjacency):
+            adjacency = self._moral_ancestral_graph(xs | ys | zs)
+
+        visited = set(xs)
+        frontier = list(xs)
+        while frontier:
+            for neighbour in adjacency[frontier.pop()]:
+                if neighbour in ys:
+                    return False
+                if neighbour not in visited and neighbour not in zs:
+                    visited.add(neighbour)
+                    frontier.append(neighbour)
         return True
 
+    def _moral_ancestral_graph(self, nodes: set[Node]) -> dict[Node, set[Node]]:
+        """Build the moral graph of the subgraph induced by the ancestors of a set of nodes.
+
+        :param nodes: The nodes whose ancestors to include.
+        :return: The moral graph as a dict mapping each node to the set of its neighbours.
+        """
+        ancestors = self._reachable(nodes, "ancestors")
+        adjacency = {node: set() for node in ancestors}
+        for child in ancestors:
+            parents = list(self.graph.predecessors(child))
+            adjacency[child].update(parents)
+            for parent in parents:
+                # Connect each parent to the child and marry it to the child's other parents
+                adjacency[parent].add(child)
+                adjacency[parent].update(parents)
+                adjacency[parent].discard(parent)
+        return adjacency
+
     def proper_causal_pathway(self, treatments: list[str], outcomes: list[str]) -> list[str]:
         """Given a list of treatments and outcomes, compute the proper causal pathways between them.
 
@@ -486,25 +759,28 @@ class CausalDAG(nx.DiGraph):
         :return vars_on_proper_causal_pathway: Return a list of the variables on the proper causal pathway between
         treatments and outcomes.
         """
-        treatments_descendants = set.union(
-            *[nx.descendants(self.graph, treatment).union({treatment}) for treatment in treatments]
-        )
-        treatments_descendants_without_treatments = set(treatments_descendants).difference(treatments)
-        backdoor_graph = self.get_backdoor_graph(set(treatments))
+        return set(self._memoised("proper_causal_pathway", treatments, outcomes, self._proper_causal_pathway))
+
+    def _proper_causal_pathway(self, treatments: list[str], outcomes: list[str]) -> set[str]:
+        treatments_mask = self._nodes_mask(treatments)
+        treatments_descendants_without_treatments = self._reachable_mask(treatments, "descendants") & ~treatments_mask
+        # Only ancestors are read from the back-door graph, so a view hiding the treatments' outgoing edges will do
+        backdoor_graph = nx.restricted_view(self.graph, [], list(self.graph.out_edges(treatments)))
         outcome_ancestors = set.union(*[nx.ancestors(backdoor_graph, outcome).union({outcome}) for outcome in outcomes])
-        nodes_on_proper_causal_paths = treatments_descendants_without_treatments.intersection(outcome_ancestors)
+        nodes_on_proper_causal_paths = self._decode_mask(
+            treatments_descendants_without_treatments & self._nodes_mask(outcome_ancestors)
+        )
         return nodes_on_proper_causal_paths
 
-    def get_backdoor_graph(self, treatments: list[str]) -> CausalDAG:
+    def get_backdoor_graph(self, treatments: list[str]) -> nx.DiGraph:
         """A back-door graph is a graph for the list of treatments is a Causal DAG in which all edges leaving the
         treatment nodes are deleted.
 
         :param treatments: The set of treatments whose outgoing edges will be deleted.
-        :return: A back-door graph corresponding to the given causal DAG and set of treatments.
+        :return: A copy of the causal DAG's graph with the treatments' outgoing edges removed.
         """
-        outgoing_edges = self.graph.out_edges(treatments)
         backdoor_graph = self.graph.copy()
-        backdoor_graph.remove_edges_from(outgoing_edges)
+        backdoor_graph.remove_edges_from(list(self.graph.out_edges(treatments)))
         return backdoor_graph
 
     def depends_on_outputs(self, node: Node, scenario: Scenario) -> bool:
@@ -512,16 +788,24 @@ class CausalDAG(nx.DiGraph):
         model output in the given scenario. That is, whether or not the model
         needs to be run to determine its value.
 
-        NOTE: The graph must be acyclic for this to terminate.
+        Each ancestor is visited at most once, stopping at the first output found.
 
         :param Node node: The node in the DAG representing the variable of interest.
         :param Scenario scenario: The modelling scenario.
         :return: Whether the given variable is or depends on an output.
         :rtype: bool
         """
-        if isinstance(scenario.variables[node], Output):
-            return True
-        return any((self.depends_on_outputs(n, scenario) for n in self.graph.predecessors(node)))
+        visited = {node}
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if isinstance(scenario.variables[current], Output):
+                return True
+            for parent in self.graph.predecessors(current):
+                if parent not in visited:
+                    visited.add(parent)
+                    stack.append(parent)
+        return False
 
     @staticmethod
     def remove_hidden_adjustment_sets(minimal_adjustment_sets: list[str], scenario: Scenario):
@@ -121,12 +121,17 @@ class MetamorphicRelation:
 
         This method must raise an assertion, not return a bool."""
 
+    def _key(self) -> tuple:
+        # An adjustment set of None is the same as an empty one, and its order does not matter
+        return self.__class__, self.treatment_var, self.output_var, frozenset(self.adjustment_vars or ())
+
     def __eq__(self, other):
-        same_type = self.__class__ == other.__class__
-        same_treatment = self.treatment_var == other.treatment_var
-        same_output = self.output_var == other.output_var
-        same_adjustment_set = set(self.adjustment_vars) == set(other.adjustment_vars)
-        return same_type and same_treatment and same_output and same_adjustment_set
+        if self.__class__ != other.__class__:
+            return False
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
 
 
 class ShouldCause(MetamorphicRelation):
@@ -232,19 +237,19 @@ def generate_metamorphic_relation(
     if nodes_to_ignore is None:
         nodes_to_ignore = set()
 
-    (u, v) = node_pair
+    u, v = node_pair
     metamorphic_relations = []
 
     # Create a ShouldNotCause relation for each pair of nodes that are not directly connected
     if ((u, v) not in dag.graph.edges) and ((v, u) not in dag.graph.edges):
         # Case 1: U --> ... --> V
-        if u in nx.ancestors(dag.graph, v):
+        if dag.is_ancestor(u, v):
             adj_sets = dag.direct_effect_adjustment_sets([u], [v], nodes_to_ignore=nodes_to_ignore)
             if adj_sets:
                 metamorphic_relations.append(ShouldNotCause(u, v, list(adj_sets[0]), dag))
 
         # Case 2: V --> ... --> U
-        elif v in nx.ancestors(dag.graph, u):
+        elif dag.is_ancestor(v, u):
             adj_sets = dag.direct_effect_adjustment_sets([v], [u], nodes_to_ignore=nodes_to_ignore)
             if adj_sets:
                 metamorphic_relations.append(ShouldNotCause(v, u, list(adj_sets[0]), dag))
@@ -70,6 +70,8 @@ class CausalSurrogateAssistedTestCase:
         self.specification = specification
         self.search_algorithm = search_algorithm
         self.simulator = simulator
+        self._surrogates = None
+        self._surrogates_key = None
 
     def execute(
         self,
@@ -92,42 +94,61 @@ class CausalSurrogateAssistedTestCase:
 
             self.simulator.startup()
             test_result = self.simulator.run_with_config(candidate_test_case)
-            test_result_df = test_result.to_dataframe()
             self.simulator.shutdown()
 
             if custom_data_aggregator is not None:
                 if data_collector.data is not None:
                     data_collector.data = custom_data_aggregator(data_collector.data, test_result.data)
             else:
-                data_collector.data = pd.concat([data_collector.data, test_result_df], ignore_index=True)
+                data_collector.data = pd.concat([data_collector.data, test_result.to_dataframe()], ignore_index=True)
             if test_result.fault:
-                print(
-                    f"Fault found between {surrogate.treatment} causing {surrogate.outcome}. Contradiction with "
-                    f"expected {surrogate.expected_relationship}."
-                )
-                test_result.relationship = (
+                relationship = (
                     f"{surrogate.treatment} -> {surrogate.outcome} expected {surrogate.expected_relationship}"
                 )
+                print(f"Fault found: {relationship}")
+                test_result.relationship = relationship
                 return test_result, i + 1, data_collector.data
 
         print("No fault found")
-        return "No fault found", i + 1, data_collector.data
+        return "No fault found", max_executions, data_collector.data
 
     def generate_surrogates(
         self, specification: CausalSpecification, data_collector: ObservationalDataCollector
     ) -> list[CubicSplineRegressionEstimator]:
         """Generate a surrogate model for each edge of the dag that specifies it is included in the DAG metadata.
+        The surrogate models are rebuilt when the causal DAG, its edges, or the scenario change, and otherwise refer to
+        the latest collected data on each call.
         :param specification: The Causal Specification (combination of Scenario and Causal Dag)
         :param data_collector: An ObservationalDataCollector which gathers data relevant to the specified scenario
         :return: A list of surrogate models
         """
+        # The graph key changes whenever the DAG is edited, and is None if edits cannot be detected
+        graph_key = specification.causal_dag._graph_key()  # pylint: disable=protected-access
+        surrogates_key = (specification.causal_dag, graph_key, specification.scenario)
+        if graph_key is None or self._surrogates_key != surrogates_key:
+            self._surrogates = self._build_surrogates(specification)
+            self._surrogates_key = surrogates_key
+
+        # Assigning the data drops each surrogate's fitted model, even if a custom data aggregator modified the same
+        # dataframe in place.
+        for surrogate in self._surrogates:
+            surrogate.df = data_collector.data
+        return list(self._surrogates)
+
+    @staticmethod
+    def _build_surrogates(specification: CausalSpecification) -> list[CubicSplineRegressionEstimator]:
+        """Build an unfitted surrogate model for each edge of the dag that specifies it is included in the DAG metadata.
+        This identifies the minimal adjustment set of each edge, so is only done when the specification changes.
+        :param specification: The Causal Specification (combination of Scenario and Causal Dag)
+        :return: A list of surrogate models without any data
+        """
         surrogate_models = []
+        variables = specification.scenario.variables
 
-        for u, v in specification.causal_dag.graph.edges:
-            edge_metadata = specification.causal_dag.graph.adj[u][v]
+        for u, v, edge_metadata in specification.causal_dag.graph.edges(data=True):
             if "included" in edge_metadata:
-                from_var = specification.scenario.variables.get(u)
-                to_var = specification.scenario.variables.get(v)
+                from_var = variables.get(u)
+                to_var = variables.get(v)
                 base_test_case = BaseTestCase(from_var, to_var)
 
                 minimal_adjustment_set = specification.causal_dag.identification(base_test_case, specification.scenario)
@@ -139,7 +160,6 @@ class CausalSurrogateAssistedTestCase:
                     minimal_adjustment_set,
                     v,
                     4,
-                    df=data_collector.data,
                     expected_relationship=edge_metadata["expected"],
                 )
                 surrogate_models.append(surrogate)
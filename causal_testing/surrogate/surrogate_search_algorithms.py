@@ -3,6 +3,7 @@
 # Fitness functions are required to be iteratively defined, including all variables within.
 
 from operator import itemgetter
+import numpy as np
 from pygad import GA
 
 from causal_testing.specification.causal_specification import CausalSpecification
@@ -16,6 +17,10 @@ class GeneticSearchAlgorithm(SearchAlgorithm):
     def __init__(self, delta=0.05, config: dict = None) -> None:
         super().__init__()
 
+        if config is not None and "gene_space" in config:
+            raise ValueError(
+                "Gene space should not be set through config. This is generated from the causal specification"
+            )
         self.delta = delta
         self.config = config
         self.contradiction_functions = {
@@ -36,29 +41,33 @@ class GeneticSearchAlgorithm(SearchAlgorithm):
 
             # The GA fitness function after including required variables into the function's scope
             # Unused arguments are required for pygad's fitness function signature
+            # The whole population is evaluated in one batch, so the surrogate is only queried once per generation
             # pylint: disable=cell-var-from-loop
-            def fitness_function(ga, solution, idx):  # pylint: disable=unused-argument
-                surrogate.control_value = solution[0] - self.delta
-                surrogate.treatment_value = solution[0] + self.delta
+            def fitness_function(ga, population, indices):  # pylint: disable=unused-argument
+                population = np.asarray(population, dtype=float)
+                pairs = np.column_stack([population[:, 0] - self.delta, population[:, 0] + self.delta])
 
                 adjustment_dict = {}
                 for i, adjustment in enumerate(surrogate.adjustment_set):
-                    adjustment_dict[adjustment] = solution[i + 1]
+                    adjustment_dict[adjustment] = population[:, i + 1]
 
-                ate = surrogate.estimate_ate_calculated(adjustment_dict)
-                if len(ate) > 1:
-                    raise ValueError(
-                        "Multiple ate values provided but currently only single values supported in this method"
-                    )
-                return contradiction_function(ate[0])
+                ates = surrogate.estimate_ate_calculated_batch(pairs, adjustment_dict)
+                return [contradiction_function(ate) for ate in ates]
 
             gene_types, gene_space = self.create_gene_types(surrogate, specification)
+            # By default the whole population is evaluated in one batch. pygad checks the batch size against the
+            # population size it was constructed with, so configured values for both must be given here rather than
+            # set afterwards
+            config = self.config if self.config is not None else {}
+            sol_per_pop = config.get("sol_per_pop", 10)
+            fitness_batch_size = config.get("fitness_batch_size", sol_per_pop)
 
             ga = GA(
                 num_generations=200,
                 num_parents_mating=4,
                 fitness_func=fitness_function,
-                sol_per_pop=10,
+                sol_per_pop=sol_per_pop,
+                fitness_batch_size=fitness_batch_size,
                 num_genes=1 + len(surrogate.adjustment_set),
                 gene_space=gene_space,
                 gene_type=gene_types,
@@ -66,11 +75,6 @@ class GeneticSearchAlgorithm(SearchAlgorithm):
 
             if self.config is not None:
                 for k, v in self.config.items():
-                    if k == "gene_space":
-                        raise ValueError(
-                            "Gene space should not be set through config. This is generated from the causal "
-                            "specification"
-                        )
                     setattr(ga, k, v)
 
             ga.run()
@@ -40,14 +40,16 @@ class DAGAdequacy:
         """
         self.pairs_to_test = set(combinations(self.causal_dag.graph.nodes(), 2))
         self.tested_pairs = set()
+        # Collect the tested pairs up front, rather than scanning the whole test suite for every pair in the DAG
+        suite_pairs = {(t.treatment_variable, t.outcome_variable) for t in self.test_suite}
 
         for n1, n2 in self.pairs_to_test:
-            if (n1, n2) in self.causal_dag.graph.edges():
-                if any((t.treatment_variable, t.outcome_variable) == (n1, n2) for t in self.test_suite):
+            if self.causal_dag.graph.has_edge(n1, n2):
+                if (n1, n2) in suite_pairs:
                     self.tested_pairs.add((n1, n2))
             else:
                 # Causal independences are not order dependent
-                if any((t.treatment_variable, t.outcome_variable) in {(n1, n2), (n2, n1)} for t in self.test_suite):
+                if (n1, n2) in suite_pairs or (n2, n1) in suite_pairs:
                     self.tested_pairs.add((n1, n2))
 
         self.untested_pairs = self.pairs_to_test.difference(self.tested_pairs)
@@ -1,6 +1,7 @@
 """This module contains the CausalTestCase class, a class that holds the information required for a causal test"""
 
 import logging
+from types import MappingProxyType
 from typing import Any
 
 from causal_testing.specification.variable import Variable
@@ -13,6 +14,9 @@ from causal_testing.data_collection.data_collector import DataCollector
 
 logger = logging.getLogger(__name__)
 
+# Shared by every test case without estimate parameters, so it must be read-only
+_NO_ESTIMATE_PARAMS = MappingProxyType({})
+
 
 class CausalTestCase:
     # pylint: disable=too-many-instance-attributes
@@ -40,6 +44,7 @@ class CausalTestCase:
         :param control_value: The control value for the treatment variable (before intervention).
         :param treatment_value: The treatment value for the treatment variable (after intervention).
         :param estimate_type: A string which denotes the type of estimate to return
+        :param estimate_params: Keyword arguments to pass to the estimate method
         :param effect_modifier_configuration:
         """
         self.base_test_case = base_test_case
@@ -49,8 +54,7 @@ class CausalTestCase:
         self.treatment_variable = base_test_case.treatment_variable
         self.treatment_value = treatment_value
         self.estimate_type = estimate_type
-        if estimate_params is None:
-            self.estimate_params = {}
+        self.estimate_params = _NO_ESTIMATE_PARAMS if estimate_params is None else estimate_params
         self.effect = base_test_case.effect
 
         if effect_modifier_configuration:
@@ -77,9 +81,9 @@ class CausalTestCase:
         :param estimator: An Estimator class object
         :return: a CausalTestResult object containing the confidence intervals
         """
-        if not hasattr(estimator, f"estimate_{self.estimate_type}"):
+        estimate_effect = getattr(estimator, f"estimate_{self.estimate_type}", None)
+        if estimate_effect is None:
             raise AttributeError(f"{estimator.__class__} has no {self.estimate_type} method.")
-        estimate_effect = getattr(estimator, f"estimate_{self.estimate_type}")
         effect, confidence_intervals = estimate_effect(**self.estimate_params)
         return CausalTestResult(
             estimator=estimator,
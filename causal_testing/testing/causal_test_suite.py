@@ -60,8 +60,8 @@ class CausalTestSuite(UserDict):
             raise ValueError("No data has been loaded. Please call load_data prior to executing a causal test case.")
         test_suite_results = {}
         for edge in self:
-            logger.info("treatment: %s", edge.treatment_variable)
-            logger.info("outcome: %s", edge.outcome_variable)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("treatment: %s outcome: %s", edge.treatment_variable, edge.outcome_variable)
             minimal_adjustment_set = causal_specification.causal_dag.identification(edge)
             minimal_adjustment_set = minimal_adjustment_set - set(edge.treatment_variable.name)
             minimal_adjustment_set = minimal_adjustment_set - set(edge.outcome_variable.name)
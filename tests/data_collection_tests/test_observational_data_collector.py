@@ -3,6 +3,7 @@ import os
 import shutil, tempfile
 import pandas as pd
 from causal_testing.data_collection.data_collector import ObservationalDataCollector
+from causal_testing.estimation.linear_regression_estimator import LinearRegressionEstimator
 from causal_testing.specification.causal_specification import Scenario
 from causal_testing.specification.variable import Input, Output, Meta
 from scipy.stats import uniform, rv_discrete
@@ -65,6 +66,32 @@ class TestObservationalDataCollector(unittest.TestCase):
         data = observational_data_collector.collect_data()
         assert all((m == 2 * x1 for x1, m in zip(data["X1"], data["M"])))
 
+    def test_collected_data_cached_until_data_replaced(self):
+        scenario = Scenario({self.X1, self.X2, self.X3, self.Y1, self.Y2}, {self.X1.z3 > 2})
+        observational_data_collector = ObservationalDataCollector(scenario, self.observational_df)
+        df = observational_data_collector.collect_data()
+        self.assertTrue(observational_data_collector.collect_data().equals(df))
+        observational_data_collector.data = self.observational_df.loc[[0, 3]]
+        expected = self.observational_df.loc[[3]]
+        assert observational_data_collector.collect_data().equals(expected)
+
+    def test_collected_data_not_shared_between_calls(self):
+        scenario = Scenario({self.X1, self.X2, self.X3, self.Y1, self.Y2}, {self.X1.z3 > 2})
+        observational_data_collector = ObservationalDataCollector(scenario, self.observational_df)
+        estimator = LinearRegressionEstimator("X1", 4, 3, set(), "Y1", observational_data_collector.collect_data())
+        estimator.df["fault_time"] = 0
+        df = observational_data_collector.collect_data()
+        self.assertNotIn("fault_time", df)
+        self.assertTrue(df.equals(self.observational_df.loc[[2, 3]]))
+
+    def test_collected_data_refiltered_when_scenario_replaced(self):
+        observational_data_collector = ObservationalDataCollector(
+            Scenario({self.X1, self.X2, self.X3, self.Y1, self.Y2}, {self.X1.z3 > 2}), self.observational_df
+        )
+        observational_data_collector.collect_data()
+        observational_data_collector.scenario = Scenario({self.X1, self.X2, self.X3, self.Y1, self.Y2})
+        self.assertEqual(len(observational_data_collector.collect_data()), 4)
+
     def tearDown(self) -> None:
         shutil.rmtree(self.temp_dir_path)
 
@@ -42,3 +42,29 @@ class TestCubicSplineRegressionEstimator(TestLinearRegressionEstimator):
         # Doubling the treatemebnt value should roughly but not exactly double the ATE
         self.assertNotEqual(ate_1[0] * 2, ate_2[0])
         self.assertAlmostEqual(ate_1[0] * 2, ate_2[0])
+
+    def test_estimate_ate_calculated_batch(self):
+        df = self.chapter_11_df.copy()
+        cublic_spline_estimator = CubicSplineRegressionEstimator("treatments", 1, 0, set(), "outcomes", 3, df)
+
+        pairs = np.array([[0, 1], [10, 20], [90, 100]])
+        ates = cublic_spline_estimator.estimate_ate_calculated_batch(pairs)
+
+        for (control_value, treatment_value), ate in zip(pairs, ates):
+            cublic_spline_estimator.control_value = control_value
+            cublic_spline_estimator.treatment_value = treatment_value
+            self.assertAlmostEqual(cublic_spline_estimator.estimate_ate_calculated()[0], ate)
+
+    def test_estimate_ate_calculated_array_like_adjustment(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({"X": rng.uniform(0, 10, 100), "Z": rng.uniform(0, 10, 100)})
+        df["Y"] = np.sin(df["X"]) + df["Z"] + rng.normal(0, 0.1, 100)
+        cublic_spline_estimator = CubicSplineRegressionEstimator("X", 6, 2, {"Z"}, "Y", 4, df)
+
+        ate = cublic_spline_estimator.estimate_ate_calculated({"Z": 3.0})
+        model = cublic_spline_estimator.model
+        treated, control = model.predict(pd.DataFrame({"X": [6, 2], "Z": [3.0, 3.0]}))
+        expected = treated - control
+        self.assertAlmostEqual(ate[0], expected)
+        self.assertAlmostEqual(cublic_spline_estimator.estimate_ate_calculated({"Z": [3.0]})[0], expected)
+        self.assertAlmostEqual(cublic_spline_estimator.estimate_ate_calculated({"Z": pd.Series([3.0])})[0], expected)
@@ -1,6 +1,10 @@
+import io
 import unittest
+import warnings
+from contextlib import redirect_stdout
 import pandas as pd
 import numpy as np
+import statsmodels.formula.api as smf
 import matplotlib.pyplot as plt
 from causal_testing.specification.variable import Input
 from causal_testing.utils.validation import CausalValidator
@@ -285,6 +289,117 @@ class TestLinearRegressionEstimator(unittest.TestCase):
         cv = CausalValidator()
         self.assertEqual(round(cv.estimate_robustness(linear_regression_estimator.model)["treatments"], 4), 0.7353)
 
+    def test_model_cached_between_estimates(self):
+        df = self.chapter_11_df.copy()
+        linear_regression_estimator = LinearRegressionEstimator("treatments", 100, 90, set(), "outcomes", df)
+        linear_regression_estimator.estimate_coefficient()
+        model = linear_regression_estimator.model
+        linear_regression_estimator.estimate_ate()
+        self.assertIs(linear_regression_estimator.model, model)
+        linear_regression_estimator.formula = "outcomes ~ treatments + I(treatments ** 2)"
+        linear_regression_estimator.estimate_ate()
+        self.assertIsNot(linear_regression_estimator.model, model)
+
+    def test_model_refitted_when_df_replaced(self):
+        df = self.chapter_11_df.copy()
+        linear_regression_estimator = LinearRegressionEstimator("treatments", 100, 90, set(), "outcomes", df)
+        ate, _ = linear_regression_estimator.estimate_ate()
+        doubled_df = df.copy()
+        doubled_df["outcomes"] *= 2
+        linear_regression_estimator.df = doubled_df
+        self.assertIsNone(linear_regression_estimator.model)
+        doubled_ate, _ = linear_regression_estimator.estimate_ate()
+        self.assertAlmostEqual(doubled_ate[0], 2 * ate[0])
+
+    def test_fit_matches_statsmodels(self):
+        formula = "wt82_71 ~ qsmk + age + I(age ** 2) + wt71 + smokeintensity"
+        linear_regression_estimator = LinearRegressionEstimator(
+            "qsmk", 1, 0, set(), "wt82_71", self.nhefs_df, formula=formula
+        )
+        model = linear_regression_estimator._run_regression()
+        expected = smf.ols(formula, self.nhefs_df).fit()
+        self.assertTrue(np.allclose(model.params, expected.params))
+        self.assertTrue(np.allclose(model.bse, expected.bse))
+        self.assertEqual(model.df_resid, expected.df_resid)
+
+    def test_fit_rank_deficient(self):
+        df = self.chapter_11_df.copy()
+        df["double_treatments"] = 2 * df["treatments"]
+        formula = "outcomes ~ treatments + double_treatments"
+        linear_regression_estimator = LinearRegressionEstimator(
+            "treatments", 1, 0, set(), "outcomes", df, formula=formula
+        )
+        model = linear_regression_estimator._run_regression()
+        expected = smf.ols(formula, df).fit()
+        self.assertEqual(model.df_resid, expected.df_resid)
+        self.assertTrue(np.allclose(model.fittedvalues, expected.fittedvalues))
+
+    def test_ate_matches_t_test(self):
+        df = self.chapter_11_df.copy()
+        linear_regression_estimator = LinearRegressionEstimator(
+            "treatments", 100, 90, set(), "outcomes", df, formula="outcomes ~ treatments + I(treatments ** 2)"
+        )
+        ate, [ci_low, ci_high] = linear_regression_estimator.estimate_ate()
+        t_test = linear_regression_estimator.model.t_test([0, 10, 0])
+        self.assertAlmostEqual(ate[0], t_test.effect[0])
+        self.assertTrue(np.allclose([ci_low[0], ci_high[0]], t_test.conf_int(alpha=0.05).flatten()))
+
+    def test_ate_batch(self):
+        df = self.chapter_11_df.copy()
+        linear_regression_estimator = LinearRegressionEstimator("treatments", None, None, set(), "outcomes", df)
+        pairs = [(90, 100), (0, 50), (10, 5)]
+        batch = linear_regression_estimator.estimate_ate_batch(pairs)
+        self.assertEqual(batch.shape, (3, 3))
+        for (control_value, treatment_value), row in zip(pairs, batch):
+            linear_regression_estimator.control_value = control_value
+            linear_regression_estimator.treatment_value = treatment_value
+            ate, [ci_low, ci_high] = linear_regression_estimator.estimate_ate()
+            self.assertTrue(np.allclose(row, [ate[0], ci_low[0], ci_high[0]]))
+
+    def test_nan_covariance_gives_nan_intervals(self):
+        df = pd.DataFrame({"treatments": [90.0, 100.0], "outcomes": [1.0, 2.0]})
+        linear_regression_estimator = LinearRegressionEstimator("treatments", 100, 90, set(), "outcomes", df)
+        with warnings.catch_warnings():
+            warnings.filterwarnings("error", message="invalid value encountered", category=RuntimeWarning)
+            _, [ci_low, ci_high] = linear_regression_estimator.estimate_ate()
+            batch = linear_regression_estimator.estimate_ate_batch([(90, 100)])
+            _, [calculated_ci_low, calculated_ci_high] = linear_regression_estimator.estimate_ate_calculated()
+        self.assertTrue(np.isnan([ci_low[0], ci_high[0], calculated_ci_low[0], calculated_ci_high[0]]).all())
+        self.assertTrue(np.isnan(batch[:, 1:]).all())
+
+    def test_ate_calculated_does_not_print(self):
+        df = self.chapter_11_df.copy()
+        linear_regression_estimator = LinearRegressionEstimator("treatments", 100, 90, set(), "outcomes", df)
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            linear_regression_estimator.estimate_ate_calculated()
+            linear_regression_estimator.estimate_risk_ratio()
+        self.assertEqual(stdout.getvalue(), "")
+
+    def test_predict_matches_get_prediction(self):
+        df = self.chapter_11_df.copy()
+        linear_regression_estimator = LinearRegressionEstimator(
+            "treatments", 100, 90, set(), "outcomes", df, formula="outcomes ~ treatments + I(treatments ** 2)"
+        )
+        prediction = linear_regression_estimator._predict()
+        expected = linear_regression_estimator.model.get_prediction(
+            pd.DataFrame({"treatments": [100, 90]})
+        ).summary_frame()[["mean", "mean_ci_lower", "mean_ci_upper"]]
+        self.assertTrue(np.allclose(prediction.to_numpy(), expected.to_numpy()))
+
+    def test_ate_calculated_intervals_ignore_alpha(self):
+        df = self.chapter_11_df.copy()
+        default_alpha_estimator = LinearRegressionEstimator("treatments", 100, 90, set(), "outcomes", df)
+        other_alpha_estimator = LinearRegressionEstimator("treatments", 100, 90, set(), "outcomes", df, alpha=0.2)
+        _, [ci_low, ci_high] = default_alpha_estimator.estimate_ate_calculated()
+        _, [other_ci_low, other_ci_high] = other_alpha_estimator.estimate_ate_calculated()
+        self.assertAlmostEqual(other_ci_low[0], ci_low[0])
+        self.assertAlmostEqual(other_ci_high[0], ci_high[0])
+        _, [ci_low, ci_high] = default_alpha_estimator.estimate_risk_ratio()
+        _, [other_ci_low, other_ci_high] = other_alpha_estimator.estimate_risk_ratio()
+        self.assertAlmostEqual(other_ci_low[0], ci_low[0])
+        self.assertAlmostEqual(other_ci_high[0], ci_high[0])
+
     def test_gp(self):
         df = pd.DataFrame()
         df["X"] = np.arange(10)
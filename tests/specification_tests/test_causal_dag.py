@@ -2,6 +2,7 @@ import unittest
 import os
 import shutil, tempfile
 import networkx as nx
+import pydot
 from causal_testing.specification.causal_dag import CausalDAG, close_separator, list_all_min_sep
 from causal_testing.specification.scenario import Scenario
 from causal_testing.specification.variable import Input, Output
@@ -13,11 +14,12 @@ class TestCausalDAGIssue90(unittest.TestCase):
     Test the CausalDAG class for the resolution of Issue 90.
     """
 
-    def setUp(self) -> None:
-        self.temp_dir_path = tempfile.mkdtemp()
-        self.dag_dot_path = os.path.join(self.temp_dir_path, "dag.dot")
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_dir_path = tempfile.mkdtemp()
+        cls.dag_dot_path = os.path.join(cls.temp_dir_path, "dag.dot")
         dag_dot = """digraph DAG { rankdir=LR; Z -> X; X -> M; M -> Y; Z -> M; }"""
-        with open(self.dag_dot_path, "w") as f:
+        with open(cls.dag_dot_path, "w") as f:
             f.write(dag_dot)
 
     def test_enumerate_minimal_adjustment_sets(self):
@@ -27,16 +29,18 @@ class TestCausalDAGIssue90(unittest.TestCase):
         adjustment_sets = causal_dag.enumerate_minimal_adjustment_sets(xs, ys)
         self.assertEqual([{"Z"}], adjustment_sets)
 
-    def tearDown(self) -> None:
-        shutil.rmtree(self.temp_dir_path)
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.temp_dir_path)
 
 
 class TestIVAssumptions(unittest.TestCase):
-    def setUp(self) -> None:
-        self.temp_dir_path = tempfile.mkdtemp()
-        self.dag_dot_path = os.path.join(self.temp_dir_path, "dag.dot")
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_dir_path = tempfile.mkdtemp()
+        cls.dag_dot_path = os.path.join(cls.temp_dir_path, "dag.dot")
         dag_dot = """digraph G { I -> X; X -> Y; U -> X; U -> Y;}"""
-        f = open(self.dag_dot_path, "w")
+        f = open(cls.dag_dot_path, "w")
         f.write(dag_dot)
         f.close()
 
@@ -62,8 +66,9 @@ class TestIVAssumptions(unittest.TestCase):
         with self.assertRaises(ValueError):
             causal_dag.check_iv_assumptions("X", "Y", "I")
 
-    def tearDown(self) -> None:
-        shutil.rmtree(self.temp_dir_path)
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.temp_dir_path)
 
 
 class TestCausalDAG(unittest.TestCase):
@@ -74,11 +79,12 @@ class TestCausalDAG(unittest.TestCase):
     graphs without cycles) and refuses to create invalid (cycle-containing) graphs.
     """
 
-    def setUp(self) -> None:
-        self.temp_dir_path = tempfile.mkdtemp()
-        self.dag_dot_path = os.path.join(self.temp_dir_path, "dag.dot")
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_dir_path = tempfile.mkdtemp()
+        cls.dag_dot_path = os.path.join(cls.temp_dir_path, "dag.dot")
         dag_dot = """digraph G { A -> B; B -> C; D -> A; D -> C;}"""
-        f = open(self.dag_dot_path, "w")
+        f = open(cls.dag_dot_path, "w")
         f.write(dag_dot)
         f.close()
 
@@ -98,6 +104,82 @@ class TestCausalDAG(unittest.TestCase):
         causal_dag = CausalDAG(self.dag_dot_path)
         self.assertRaises(nx.HasACycle, causal_dag.add_edge, "C", "A")
 
+    def test_rejected_edge_not_added(self):
+        """Test whether an edge that would create a cycle is left out of the graph."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        with self.assertRaises(nx.HasACycle):
+            causal_dag.add_edge("C", "D")
+        self.assertNotIn(("C", "D"), causal_dag.graph.edges)
+        self.assertTrue(causal_dag.is_acyclic())
+
+    def test_add_edge_self_loop(self):
+        """Test whether a self-loop is rejected as a cycle."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        self.assertRaises(nx.HasACycle, causal_dag.add_edge, "A", "A")
+
+    def test_add_edge_against_topological_order(self):
+        """Test whether an edge against the current topological order is accepted when it does not create a cycle."""
+        causal_dag = CausalDAG()
+        for u, v in [("A", "B"), ("C", "D"), ("D", "A"), ("E", "C"), ("B", "F")]:
+            causal_dag.add_edge(u, v)
+        self.assertRaises(nx.HasACycle, causal_dag.add_edge, "F", "E")
+        causal_dag.add_edge("F", "G")
+        self.assertEqual(list(nx.topological_sort(causal_dag.graph)), ["E", "C", "D", "A", "B", "F", "G"])
+
+    def test_add_edge_after_direct_graph_edit(self):
+        """Test whether add_edge still detects cycles through edges added directly to the underlying graph."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        causal_dag.add_edge("C", "E")
+        causal_dag.graph.add_edge("E", "F")
+        self.assertRaises(nx.HasACycle, causal_dag.add_edge, "F", "A")
+
+    def test_add_edge_after_same_size_graph_edit(self):
+        """Test whether add_edge detects cycles after a direct edit that keeps the numbers of nodes and edges."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        causal_dag.add_edge("A", "C")
+        causal_dag.graph.remove_edge("D", "A")
+        causal_dag.graph.add_edge("B", "D")
+        self.assertRaises(nx.HasACycle, causal_dag.add_edge, "D", "A")
+        self.assertTrue(causal_dag.is_acyclic())
+
+    def test_is_ancestor_after_same_size_graph_edit(self):
+        """Test whether is_ancestor reflects a direct edit that keeps the numbers of nodes and edges."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        self.assertFalse(causal_dag.is_ancestor("B", "D"))
+        self.assertTrue(causal_dag.is_ancestor("D", "B"))
+        causal_dag.graph.remove_edge("D", "A")
+        causal_dag.graph.add_edge("B", "D")
+        self.assertTrue(causal_dag.is_ancestor("B", "D"))
+        self.assertFalse(causal_dag.is_ancestor("D", "B"))
+
+    def test_adjustment_sets_after_same_size_graph_edit(self):
+        """Test whether identification reflects a direct edit that keeps the numbers of nodes and edges."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        self.assertEqual(causal_dag.enumerate_minimal_adjustment_sets(["A"], ["C"]), [{"D"}])
+        causal_dag.graph.remove_edge("D", "A")
+        causal_dag.graph.add_edge("B", "D")
+        fresh_dag = CausalDAG()
+        fresh_dag.add_edges_from_safe(causal_dag.graph.edges)
+        self.assertEqual(
+            causal_dag.enumerate_minimal_adjustment_sets(["A"], ["C"]),
+            fresh_dag.enumerate_minimal_adjustment_sets(["A"], ["C"]),
+        )
+        self.assertEqual(causal_dag.enumerate_minimal_adjustment_sets(["A"], ["C"]), [set()])
+
+    def test_add_edges_from_safe(self):
+        """Test whether edges can be added in bulk."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        causal_dag.add_edges_from_safe([("C", "E"), ("E", "F"), ("D", "F")])
+        self.assertTrue({("C", "E"), ("E", "F"), ("D", "F")}.issubset(causal_dag.graph.edges))
+
+    def test_add_edges_from_safe_cycle(self):
+        """Test whether a bulk addition that creates a cycle is rejected without changing the graph."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        edges, nodes = list(causal_dag.graph.edges), list(causal_dag.graph.nodes)
+        self.assertRaises(nx.HasACycle, causal_dag.add_edges_from_safe, [("C", "E"), ("A", "B"), ("E", "D")])
+        self.assertEqual(list(causal_dag.graph.edges), edges)
+        self.assertEqual(list(causal_dag.graph.nodes), nodes)
+
     def test_empty_casual_dag(self):
         """Test whether an empty dag can be created."""
         causal_dag = CausalDAG()
@@ -107,8 +189,59 @@ class TestCausalDAG(unittest.TestCase):
         causal_dag = CausalDAG(self.dag_dot_path)
         self.assertEqual(causal_dag.to_dot_string(), """digraph G {\nA -> B;\nB -> C;\nD -> A;\nD -> C;\n}""")
 
-    def tearDown(self) -> None:
-        shutil.rmtree(self.temp_dir_path)
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.temp_dir_path)
+
+
+class TestDotParsing(unittest.TestCase):
+    """
+    Test that simple dot files, which are parsed without pydot, give the same graph as parsing them with pydot.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_dir_path = tempfile.mkdtemp()
+        cls.dag_dot_path = os.path.join(cls.temp_dir_path, "dag.dot")
+
+    def assert_same_as_pydot(self, dag_dot):
+        with open(self.dag_dot_path, "w") as f:
+            f.write(dag_dot)
+        causal_dag = CausalDAG(self.dag_dot_path)
+        pydot_graph = nx.DiGraph(
+            nx.drawing.nx_pydot.from_pydot(pydot.graph_from_dot_data(dag_dot.replace("\n", ""))[0])
+        )
+        self.assertEqual(list(causal_dag.graph.nodes(data=True)), list(pydot_graph.nodes(data=True)))
+        self.assertEqual(list(causal_dag.graph.edges(data=True)), list(pydot_graph.edges(data=True)))
+        self.assertEqual(causal_dag.graph.graph, pydot_graph.graph)
+
+    def test_simple_dot(self):
+        self.assert_same_as_pydot("""digraph CausalDAG {\n rankdir=LR;\n "a b" -> c -> d;\n "e";\n a -> d;\n}""")
+
+    def test_dot_with_attributes(self):
+        self.assert_same_as_pydot("""digraph G { a -> b [color="green"]; c [test=True]; node [shape=box]; b -> c }""")
+
+    def test_reloaded_dot_is_independent(self):
+        with open(self.dag_dot_path, "w") as f:
+            f.write("""digraph G { rankdir=LR; a -> b; b -> c }""")
+        first_dag = CausalDAG(self.dag_dot_path)
+        first_dag.add_edge("a", "c")
+        first_dag.graph.graph["graph"]["rankdir"] = "TB"
+        second_dag = CausalDAG(self.dag_dot_path)
+        self.assertEqual(list(second_dag.graph.edges), [("a", "b"), ("b", "c")])
+        self.assertEqual(second_dag.graph.graph["graph"], {"rankdir": "LR"})
+
+    def test_changed_dot_is_reloaded(self):
+        with open(self.dag_dot_path, "w") as f:
+            f.write("""digraph G { a -> b }""")
+        CausalDAG(self.dag_dot_path)
+        with open(self.dag_dot_path, "w") as f:
+            f.write("""digraph G { a -> b -> c }""")
+        self.assertEqual(list(CausalDAG(self.dag_dot_path).graph.edges), [("a", "b"), ("b", "c")])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.temp_dir_path)
 
 
 class TestCyclicCausalDAG(unittest.TestCase):
@@ -116,19 +249,21 @@ class TestCyclicCausalDAG(unittest.TestCase):
     Test the creation of a cyclic causal graph.
     """
 
-    def setUp(self) -> None:
-        self.temp_dir_path = tempfile.mkdtemp()
-        self.dag_dot_path = os.path.join(self.temp_dir_path, "dag.dot")
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_dir_path = tempfile.mkdtemp()
+        cls.dag_dot_path = os.path.join(cls.temp_dir_path, "dag.dot")
         dag_dot = """digraph G { A -> B; B -> C; D -> A; D -> C; C -> A;}"""
-        f = open(self.dag_dot_path, "w")
+        f = open(cls.dag_dot_path, "w")
         f.write(dag_dot)
         f.close()
 
     def test_invalid_causal_dag(self):
         self.assertRaises(nx.HasACycle, CausalDAG, self.dag_dot_path)
 
-    def tearDown(self) -> None:
-        shutil.rmtree(self.temp_dir_path)
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.temp_dir_path)
 
 
 class TestDAGDirectEffectIdentification(unittest.TestCase):
@@ -136,11 +271,12 @@ class TestDAGDirectEffectIdentification(unittest.TestCase):
     Test the Causal DAG identification algorithms and supporting algorithms.
     """
 
-    def setUp(self) -> None:
-        self.temp_dir_path = tempfile.mkdtemp()
-        self.dag_dot_path = os.path.join(self.temp_dir_path, "dag.dot")
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_dir_path = tempfile.mkdtemp()
+        cls.dag_dot_path = os.path.join(cls.temp_dir_path, "dag.dot")
         dag_dot = """digraph G { X1->X2;X2->V;X2->D1;X2->D2;D1->Y;D1->D2;Y->D3;Z->X2;Z->Y;}"""
-        f = open(self.dag_dot_path, "w")
+        f = open(cls.dag_dot_path, "w")
         f.write(dag_dot)
         f.close()
 
@@ -149,13 +285,21 @@ class TestDAGDirectEffectIdentification(unittest.TestCase):
         adjustment_sets = causal_dag.direct_effect_adjustment_sets(["X1"], ["Y"])
         self.assertEqual(list(adjustment_sets), [{"D1", "Z"}, {"X2", "Z"}])
 
+    def test_adjustment_sets_repeated(self):
+        """Test whether repeated identification queries on the same DAG give the same adjustment sets."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        for _ in range(2):
+            self.assertEqual(list(causal_dag.direct_effect_adjustment_sets(["X1"], ["Y"])), [{"D1", "Z"}, {"X2", "Z"}])
+            self.assertEqual(causal_dag.enumerate_minimal_adjustment_sets(["X1", "X2"], ["Y"]), [{"Z"}])
+
     def test_direct_effect_adjustment_sets_no_adjustment(self):
         causal_dag = CausalDAG(self.dag_dot_path)
         adjustment_sets = causal_dag.direct_effect_adjustment_sets(["X2"], ["D1"])
         self.assertEqual(list(adjustment_sets), [set()])
 
-    def tearDown(self) -> None:
-        shutil.rmtree(self.temp_dir_path)
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.temp_dir_path)
 
 
 class TestDAGIdentification(unittest.TestCase):
@@ -163,11 +307,12 @@ class TestDAGIdentification(unittest.TestCase):
     Test the Causal DAG identification algorithms and supporting algorithms.
     """
 
-    def setUp(self) -> None:
-        self.temp_dir_path = tempfile.mkdtemp()
-        self.dag_dot_path = os.path.join(self.temp_dir_path, "dag.dot")
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_dir_path = tempfile.mkdtemp()
+        cls.dag_dot_path = os.path.join(cls.temp_dir_path, "dag.dot")
         dag_dot = """digraph G { X1->X2;X2->V;X2->D1;X2->D2;D1->Y;D1->D2;Y->D3;Z->X2;Z->Y;}"""
-        f = open(self.dag_dot_path, "w")
+        f = open(cls.dag_dot_path, "w")
         f.write(dag_dot)
         f.close()
 
@@ -179,6 +324,26 @@ class TestDAGIdentification(unittest.TestCase):
         self.assertEqual(list(indirect_graph.graph.edges), original_edges)
         self.assertEqual(indirect_graph.graph.nodes, causal_dag.graph.nodes)
 
+    def test_get_backdoor_graph(self):
+        """Test whether the back-door graph removes the treatments' outgoing edges without modifying the causal DAG."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        backdoor_graph = causal_dag.get_backdoor_graph({"X2"})
+        self.assertEqual(set(backdoor_graph.out_edges("X2")), set())
+        self.assertEqual(set(backdoor_graph.in_edges("X2")), {("X1", "X2"), ("Z", "X2")})
+        self.assertEqual(set(causal_dag.graph.out_edges("X2")), {("X2", "V"), ("X2", "D1"), ("X2", "D2")})
+
+    def test_derived_graphs_are_modifiable_copies(self):
+        """Test whether the indirect and back-door graphs can be modified without modifying the causal DAG."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        original_edges = list(causal_dag.graph.edges)
+        indirect_graph = causal_dag.get_indirect_graph(["D1"], ["Y"])
+        indirect_graph.add_edge("Y", "W")
+        backdoor_graph = causal_dag.get_backdoor_graph({"X2"})
+        backdoor_graph.remove_edge("X1", "X2")
+        self.assertIn(("Y", "W"), indirect_graph.graph.edges)
+        self.assertNotIn(("X1", "X2"), backdoor_graph.edges)
+        self.assertEqual(list(causal_dag.graph.edges), original_edges)
+
     def test_proper_backdoor_graph(self):
         """Test whether converting a Causal DAG to a proper back-door graph works correctly."""
         causal_dag = CausalDAG(self.dag_dot_path)
@@ -197,6 +362,36 @@ class TestDAGIdentification(unittest.TestCase):
         )
         self.assertTrue(set(proper_backdoor_graph.graph.edges).issubset(edges))
 
+    def test_proper_causal_pathway(self):
+        """Test whether proper_causal_pathway finds the non-treatment variables on proper causal paths from X to Y."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        self.assertEqual(causal_dag.proper_causal_pathway(["X1", "X2"], ["Y"]), {"D1", "Y"})
+
+    def test_proper_causal_pathway_after_add_edge(self):
+        """Test whether proper_causal_pathway is recomputed once the graph changes."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        self.assertEqual(causal_dag.proper_causal_pathway(["X1", "X2"], ["Y"]), {"D1", "Y"})
+        causal_dag.add_edge("V", "Y")
+        self.assertEqual(causal_dag.proper_causal_pathway(["X1", "X2"], ["Y"]), {"D1", "V", "Y"})
+
+    def test_is_ancestor(self):
+        causal_dag = CausalDAG(self.dag_dot_path)
+        for u in causal_dag.graph.nodes:
+            for v in causal_dag.graph.nodes:
+                self.assertEqual(causal_dag.is_ancestor(u, v), u in nx.ancestors(causal_dag.graph, v))
+
+    def test_d_separated(self):
+        """Test whether d_separated agrees with networkx for several separators of the same pair of nodes."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        for zs in [[], ["Z"], ["X2"], ["X2", "D1"], ["D2"], ["D3"], ["V", "Z"]]:
+            self.assertEqual(
+                causal_dag.d_separated(["X1"], ["Y"], zs), nx.d_separated(causal_dag.graph, {"X1"}, {"Y"}, set(zs))
+            )
+
+    def test_d_separated_not_disjoint(self):
+        causal_dag = CausalDAG(self.dag_dot_path)
+        self.assertRaises(nx.NetworkXError, causal_dag.d_separated, ["X1"], ["Y"], ["Y"])
+
     def test_constructive_backdoor_criterion_should_hold(self):
         """Test whether the constructive criterion holds when it should."""
         causal_dag = CausalDAG(self.dag_dot_path)
@@ -252,6 +447,14 @@ class TestDAGIdentification(unittest.TestCase):
             [("X1", "X2"), ("X2", "D1"), ("D1", "Y"), ("Z", "X2"), ("Z", "Y")],
         )
 
+    def test_get_ancestor_graph_after_add_edge(self):
+        """Test whether get_ancestor_graph reflects edges added after an earlier query."""
+        causal_dag = CausalDAG(self.dag_dot_path)
+        xs, ys = ["X1", "X2"], ["Y"]
+        self.assertNotIn("V", causal_dag.get_ancestor_graph(xs, ys).graph.nodes)
+        causal_dag.add_edge("V", "Y")
+        self.assertIn("V", causal_dag.get_ancestor_graph(xs, ys).graph.nodes)
+
     def test_get_ancestor_graph_of_proper_backdoor_graph(self):
         """Test whether get_ancestor_graph converts a CausalDAG to the correct proper back-door graph."""
         causal_dag = CausalDAG(self.dag_dot_path)
@@ -322,6 +525,16 @@ class TestDAGIdentification(unittest.TestCase):
             set_of_adjustment_sets,
         )
 
+    def test_separator_graph_edges_shared_between_directions(self):
+        """Test whether each edge added to connect the treatment and outcome neighbourhoods is a single undirected
+        edge, with one attribute dict for both directions."""
+        causal_dag = CausalDAG()
+        causal_dag.graph.add_edges_from([("Z1", "X"), ("Z2", "X"), ("Z1", "Y"), ("X", "Y"), ("Z3", "Y")])
+        separator_graph = causal_dag._separator_graph("total", ["X"], ["Y"])
+        for u, v in separator_graph.edges:
+            self.assertIs(separator_graph.adj[u][v], separator_graph.adj[v][u])
+        self.assertIn("Z3", separator_graph.adj["Z1"])
+
     def test_dag_with_non_character_nodes(self):
         """Test identification for a DAG whose nodes are not just characters (strings of length greater than 1)."""
         causal_dag = CausalDAG()
@@ -342,8 +555,9 @@ class TestDAGIdentification(unittest.TestCase):
         adjustment_sets = causal_dag.enumerate_minimal_adjustment_sets(xs, ys)
         self.assertEqual(adjustment_sets, [{"aa"}, {"la"}, {"va"}])
 
-    def tearDown(self) -> None:
-        shutil.rmtree(self.temp_dir_path)
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.temp_dir_path)
 
 
 class TestDependsOnOutputs(unittest.TestCase):
@@ -351,18 +565,20 @@ class TestDependsOnOutputs(unittest.TestCase):
     Test the depends_on_outputs method.
     """
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_dir_path = tempfile.mkdtemp()
+        cls.dag_dot_path = os.path.join(cls.temp_dir_path, "dag.dot")
+        dag_dot = """digraph G { A -> B; B -> C; D -> A; D -> C}"""
+        f = open(cls.dag_dot_path, "w")
+        f.write(dag_dot)
+        f.close()
+
     def setUp(self) -> None:
         from scipy.stats import uniform
         from causal_testing.specification.variable import Input, Output, Meta
         from causal_testing.specification.scenario import Scenario
 
-        self.temp_dir_path = tempfile.mkdtemp()
-        self.dag_dot_path = os.path.join(self.temp_dir_path, "dag.dot")
-        dag_dot = """digraph G { A -> B; B -> C; D -> A; D -> C}"""
-        f = open(self.dag_dot_path, "w")
-        f.write(dag_dot)
-        f.close()
-
         D = Input("D", float, uniform(0, 1))
         A = Meta("A", float, uniform(0, 1))
         B = Output("B", float, uniform(0, 1))
@@ -388,14 +604,21 @@ class TestDependsOnOutputs(unittest.TestCase):
         print("graph:", causal_dag)
         self.assertFalse(causal_dag.depends_on_outputs("A", self.scenario))
 
+    def test_depends_on_outputs_cyclic(self):
+        causal_dag = CausalDAG(self.dag_dot_path)
+        causal_dag.graph.add_edge("A", "D")
+        self.assertFalse(causal_dag.depends_on_outputs("A", self.scenario))
+        self.assertTrue(causal_dag.depends_on_outputs("C", self.scenario))
+
     def test_depends_on_outputs_input(self):
         causal_dag = CausalDAG(self.dag_dot_path)
         print("nodes:", causal_dag.nodes())
         print("graph:", causal_dag)
         self.assertFalse(causal_dag.depends_on_outputs("D", self.scenario))
 
-    def tearDown(self) -> None:
-        shutil.rmtree(self.temp_dir_path)
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.temp_dir_path)
 
 
 class TestUndirectedGraphAlgorithms(unittest.TestCase):
@@ -419,6 +642,11 @@ class TestUndirectedGraphAlgorithms(unittest.TestCase):
         result = close_separator(self.graph, self.treatment_node, self.outcome_node, self.treatment_node_set)
         self.assertEqual({2, 3}, result)
 
+    def test_close_separator_no_separator(self):
+        """Test whether close_separator raises an error when the outcome node neighbours the treatment set."""
+        with self.assertRaises(ValueError):
+            close_separator(self.graph, self.treatment_node, 4, {"a", 2})
+
     def test_list_all_min_sep(self):
         """Test whether list_all_min_sep finds all minimal separators for the undirected graph relative to a and b."""
         min_separators = list(
@@ -431,9 +659,8 @@ class TestUndirectedGraphAlgorithms(unittest.TestCase):
             )
         )
 
-        # Convert list of sets to set of frozen sets for comparison
-        min_separators = set(frozenset(min_separator) for min_separator in min_separators)
-        self.assertEqual({frozenset({2, 3}), frozenset({3, 4}), frozenset({4, 5})}, min_separators)
+        self.assertTrue(all(isinstance(min_separator, frozenset) for min_separator in min_separators))
+        self.assertEqual({frozenset({2, 3}), frozenset({3, 4}), frozenset({4, 5})}, set(min_separators))
 
 
 class TestHiddenVariableDAG(unittest.TestCase):
@@ -441,11 +668,12 @@ class TestHiddenVariableDAG(unittest.TestCase):
     Test the CausalDAG identification for the exclusion of hidden variables.
     """
 
-    def setUp(self) -> None:
-        self.temp_dir_path = tempfile.mkdtemp()
-        self.dag_dot_path = os.path.join(self.temp_dir_path, "dag.dot")
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_dir_path = tempfile.mkdtemp()
+        cls.dag_dot_path = os.path.join(cls.temp_dir_path, "dag.dot")
         dag_dot = """digraph DAG { rankdir=LR; Z -> X; X -> M; M -> Y; Z -> M; }"""
-        with open(self.dag_dot_path, "w") as f:
+        with open(cls.dag_dot_path, "w") as f:
             f.write(dag_dot)
 
     def test_hidden_varaible_adjustment_sets(self):
@@ -463,5 +691,6 @@ class TestHiddenVariableDAG(unittest.TestCase):
 
         self.assertNotEqual(adjustment_sets, adjustment_sets_with_hidden)
 
-    def tearDown(self) -> None:
-        shutil.rmtree(self.temp_dir_path)
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.temp_dir_path)
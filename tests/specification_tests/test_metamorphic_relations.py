@@ -367,3 +367,18 @@ class TestMetamorphicRelation(unittest.TestCase):
         sc_mr_a = ShouldCause("X", "Y", [], dag)
         sc_mr_b = ShouldNotCause("X", "Y", [], dag)
         self.assertEqual(sc_mr_a == sc_mr_b, False)
+
+    def test_equivalent_metamorphic_relations_none_adjustment_set(self):
+        dag = CausalDAG(self.dag_dot_path)
+        sc_mr_a = ShouldCause("X", "Y", None, dag)
+        sc_mr_b = ShouldCause("X", "Y", [], dag)
+        self.assertEqual(sc_mr_a == sc_mr_b, True)
+
+    def test_equivalent_metamorphic_relations_deduplicated(self):
+        dag = CausalDAG(self.dag_dot_path)
+        relations = {
+            ShouldCause("X", "Y", ["A", "B"], dag),
+            ShouldCause("X", "Y", ["B", "A"], dag),
+            ShouldNotCause("X", "Y", ["A", "B"], dag),
+        }
+        self.assertEqual(len(relations), 2)
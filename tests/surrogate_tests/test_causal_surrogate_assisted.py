@@ -1,4 +1,7 @@
+import itertools
 import unittest
+from types import MappingProxyType
+from unittest.mock import patch
 from causal_testing.data_collection.data_collector import ObservationalDataCollector
 from causal_testing.specification.causal_dag import CausalDAG
 from causal_testing.specification.causal_specification import CausalSpecification
@@ -13,7 +16,7 @@ from causal_testing.surrogate.surrogate_search_algorithms import GeneticSearchAl
 from causal_testing.estimation.cubic_spline_estimator import CubicSplineRegressionEstimator
 
 import os
-import shutil, tempfile
+import tempfile
 import pandas as pd
 import numpy as np
 
@@ -25,51 +28,57 @@ class TestSimulationResult(unittest.TestCase):
         self.data = {"key": "value"}
 
     def test_inputs(self):
-
         fault_values = [True, False]
-
         relationship_values = ["positive", "negative", None]
+        expected = list(itertools.product(fault_values, relationship_values))
 
-        for fault in fault_values:
-
-            for relationship in relationship_values:
-                with self.subTest(fault=fault, relationship=relationship):
-                    result = SimulationResult(data=self.data, fault=fault, relationship=relationship)
+        results = [
+            SimulationResult(data=self.data, fault=fault, relationship=relationship) for fault, relationship in expected
+        ]
 
-                    self.assertIsInstance(result.data, dict)
-
-                    self.assertEqual(result.fault, fault)
-
-                    self.assertEqual(result.relationship, relationship)
+        self.assertTrue(all(isinstance(result.data, dict) for result in results))
+        self.assertEqual([(result.fault, result.relationship) for result in results], expected)
 
 
 class TestCausalSurrogate(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls) -> None:
+        # Shared by every test, since neither data collection nor surrogate-assisted execution modify it in place
         cls.class_df = load_class_df()
-
-    def setUp(self):
-        self.temp_dir_path = tempfile.mkdtemp()
-        self.dag_dot_path = os.path.join(self.temp_dir_path, "dag.dot")
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.dag_dot_path = os.path.join(cls.temp_dir.name, "dag.dot")
         dag_dot = """digraph DAG { rankdir=LR; Z -> X; X -> M [included=1, expected=positive]; M -> Y [included=1, expected=negative]; Z -> M; }"""
-        with open(self.dag_dot_path, "w") as f:
+        with open(cls.dag_dot_path, "w") as f:
             f.write(dag_dot)
-
-    def test_surrogate_model_generation(self):
-        c_s_a_test_case = CausalSurrogateAssistedTestCase(None, None, None)
-
-        df = self.class_df.copy()
-
-        causal_dag = CausalDAG(self.dag_dot_path)
+        # Identification does not modify the DAG, so every test can share it
+        cls.causal_dag = CausalDAG(cls.dag_dot_path)
         z = Input("Z", int)
         x = Input("X", float)
         m = Input("M", int)
         y = Output("Y", float)
-        scenario = Scenario(variables={z, x, m, y})
-        specification = CausalSpecification(scenario, causal_dag)
+        cls.scenario = Scenario(variables={z, x, m, y})
+        # Each input is constrained to be at most 0 and at least 3
+        constraints = {constraint for v in (z, x, m) for constraint in (v <= 0, v >= 3)}
+        cls.constrained_scenario = Scenario(variables={z, x, m, y}, constraints=constraints)
+        # Read-only, so each test takes its own copy to give to the search algorithm
+        cls.search_config = MappingProxyType(
+            {
+                "parent_selection_type": "tournament",
+                "K_tournament": 4,
+                "mutation_type": "random",
+                "mutation_percent_genes": 50,
+                "mutation_by_replacement": True,
+            }
+        )
+
+    def test_surrogate_model_generation(self):
+        c_s_a_test_case = CausalSurrogateAssistedTestCase(None, None, None)
+        specification = CausalSpecification(self.scenario, self.causal_dag)
 
-        surrogate_models = c_s_a_test_case.generate_surrogates(specification, ObservationalDataCollector(scenario, df))
+        surrogate_models = c_s_a_test_case.generate_surrogates(
+            specification, ObservationalDataCollector(self.scenario, self.class_df)
+        )
         self.assertEqual(len(surrogate_models), 2)
 
         for surrogate in surrogate_models:
@@ -77,140 +86,164 @@ class TestCausalSurrogate(unittest.TestCase):
             self.assertNotEqual(surrogate.treatment, "Z")
             self.assertNotEqual(surrogate.outcome, "Z")
 
-    def test_causal_surrogate_assisted_execution(self):
-        df = self.class_df.copy()
-
-        causal_dag = CausalDAG(self.dag_dot_path)
-        z = Input("Z", int)
-        x = Input("X", float)
-        m = Input("M", int)
-        y = Output("Y", float)
-        scenario = Scenario(variables={z, x, m, y}, constraints={z <= 0, z >= 3, x <= 0, x >= 3, m <= 0, m >= 3})
-        specification = CausalSpecification(scenario, causal_dag)
+    def test_surrogate_models_reused_with_new_data(self):
+        c_s_a_test_case = CausalSurrogateAssistedTestCase(None, None, None)
+        specification = CausalSpecification(self.scenario, self.causal_dag)
 
-        search_algorithm = GeneticSearchAlgorithm(
-            config={
-                "parent_selection_type": "tournament",
-                "K_tournament": 4,
-                "mutation_type": "random",
-                "mutation_percent_genes": 50,
-                "mutation_by_replacement": True,
-            }
+        first_df = self.class_df.copy()
+        first_models = c_s_a_test_case.generate_surrogates(
+            specification, ObservationalDataCollector(self.scenario, first_df)
+        )
+        second_df = self.class_df.copy()
+        second_models = c_s_a_test_case.generate_surrogates(
+            specification, ObservationalDataCollector(self.scenario, second_df)
         )
-        simulator = TestSimulator()
 
-        c_s_a_test_case = CausalSurrogateAssistedTestCase(specification, search_algorithm, simulator)
+        self.assertEqual(len(second_models), 2)
+        for first, second in zip(first_models, second_models):
+            self.assertIs(first, second)
+            self.assertIs(second.df, second_df)
 
-        result, iterations, result_data = c_s_a_test_case.execute(ObservationalDataCollector(scenario, df))
+    def test_surrogate_models_rebuilt_after_dag_edited(self):
+        c_s_a_test_case = CausalSurrogateAssistedTestCase(None, None, None)
+        causal_dag = CausalDAG(self.dag_dot_path)
+        specification = CausalSpecification(self.scenario, causal_dag)
+        data_collector = ObservationalDataCollector(self.scenario, self.class_df)
 
-        self.assertIsInstance(result, SimulationResult)
-        self.assertEqual(iterations, 1)
-        self.assertEqual(len(result_data), 17)
+        first_models = c_s_a_test_case.generate_surrogates(specification, data_collector)
+        causal_dag.graph.add_edge("Z", "Y", included=1, expected="positive")
+        second_models = c_s_a_test_case.generate_surrogates(specification, data_collector)
 
-    def test_causal_surrogate_assisted_execution_failure(self):
-        df = self.class_df.copy()
+        self.assertEqual(len(first_models), 2)
+        self.assertEqual(len(second_models), 3)
 
-        causal_dag = CausalDAG(self.dag_dot_path)
-        z = Input("Z", int)
-        x = Input("X", float)
-        m = Input("M", int)
-        y = Output("Y", float)
-        scenario = Scenario(variables={z, x, m, y}, constraints={z <= 0, z >= 3, x <= 0, x >= 3, m <= 0, m >= 3})
-        specification = CausalSpecification(scenario, causal_dag)
+    def test_surrogate_models_rebuilt_after_scenario_replaced(self):
+        c_s_a_test_case = CausalSurrogateAssistedTestCase(None, None, None)
+        specification = CausalSpecification(self.scenario, self.causal_dag)
+        data_collector = ObservationalDataCollector(self.scenario, self.class_df)
 
-        search_algorithm = GeneticSearchAlgorithm(
-            config={
-                "parent_selection_type": "tournament",
-                "K_tournament": 4,
-                "mutation_type": "random",
-                "mutation_percent_genes": 50,
-                "mutation_by_replacement": True,
-            }
-        )
-        simulator = TestSimulatorFailing()
+        first_models = c_s_a_test_case.generate_surrogates(specification, data_collector)
+        specification.scenario = self.constrained_scenario
+        second_models = c_s_a_test_case.generate_surrogates(specification, data_collector)
 
-        c_s_a_test_case = CausalSurrogateAssistedTestCase(specification, search_algorithm, simulator)
+        self.assertEqual(len(second_models), 2)
+        for first, second in zip(first_models, second_models):
+            self.assertIsNot(first, second)
 
-        result, iterations, result_data = c_s_a_test_case.execute(ObservationalDataCollector(scenario, df), 1)
+    def test_surrogate_models_refitted_after_data_modified_in_place(self):
+        c_s_a_test_case = CausalSurrogateAssistedTestCase(None, None, None)
+        specification = CausalSpecification(self.scenario, self.causal_dag)
+        data_collector = ObservationalDataCollector(self.scenario, self.class_df.copy())
 
-        self.assertIsInstance(result, str)
-        self.assertEqual(iterations, 1)
-        self.assertEqual(len(result_data), 17)
+        surrogate = c_s_a_test_case.generate_surrogates(specification, data_collector)[0]
+        adjustment_config = {v: [self.class_df[v].mean()] for v in surrogate.adjustment_set}
+        first_ate = surrogate.estimate_ate_calculated_batch([[0, 1]], adjustment_config)
+        data_collector.data[surrogate.outcome] *= 2
+        surrogate = c_s_a_test_case.generate_surrogates(specification, data_collector)[0]
+        second_ate = surrogate.estimate_ate_calculated_batch([[0, 1]], adjustment_config)
+        self.assertTrue(np.allclose(second_ate, 2 * first_ate))
 
-    def test_causal_surrogate_assisted_execution_custom_aggregator(self):
-        df = self.class_df.copy()
+    def test_causal_surrogate_assisted_execution(self):
+        # Simulator, maximum executions, data aggregator, expected result type, and expected amount of data
+        cases = [
+            (TestSimulator(), 200, None, SimulationResult, 17),
+            (TestSimulatorFailing(), 1, None, str, 17),
+            (TestSimulator(), 200, data_double_aggregator, SimulationResult, 18),
+        ]
+        for simulator, max_executions, aggregator, result_type, data_length in cases:
+            with self.subTest(simulator=type(simulator).__name__, aggregator=aggregator):
+                specification = CausalSpecification(self.constrained_scenario, self.causal_dag)
+                search_algorithm = GeneticSearchAlgorithm(config=dict(self.search_config))
+                c_s_a_test_case = CausalSurrogateAssistedTestCase(specification, search_algorithm, simulator)
+
+                result, iterations, result_data = c_s_a_test_case.execute(
+                    ObservationalDataCollector(self.constrained_scenario, self.class_df),
+                    max_executions,
+                    custom_data_aggregator=aggregator,
+                )
+
+                self.assertIsInstance(result, result_type)
+                self.assertEqual(iterations, 1)
+                self.assertEqual(len(result_data), data_length)
+
+    def test_search_evaluates_whole_population_in_one_batch(self):
+        specification = CausalSpecification(self.constrained_scenario, self.causal_dag)
+        c_s_a_test_case = CausalSurrogateAssistedTestCase(None, None, None)
+        surrogate = c_s_a_test_case.generate_surrogates(
+            specification, ObservationalDataCollector(self.constrained_scenario, self.class_df)
+        )[0]
+        search_algorithm = GeneticSearchAlgorithm(config={**self.search_config, "sol_per_pop": 20})
+
+        with patch.object(
+            surrogate, "estimate_ate_calculated_batch", wraps=surrogate.estimate_ate_calculated_batch
+        ) as batch:
+            search_algorithm.search([surrogate], specification)
+        # Later generations skip the solutions whose fitness pygad already knows, so only the first is a full batch
+        self.assertEqual(len(batch.call_args_list[0].args[0]), 20)
+        self.assertLessEqual(max(len(call.args[0]) for call in batch.call_args_list), 20)
+
+    def test_search_uses_configured_fitness_batch_size(self):
+        specification = CausalSpecification(self.constrained_scenario, self.causal_dag)
+        c_s_a_test_case = CausalSurrogateAssistedTestCase(None, None, None)
+        surrogate = c_s_a_test_case.generate_surrogates(
+            specification, ObservationalDataCollector(self.constrained_scenario, self.class_df)
+        )[0]
+        search_algorithm = GeneticSearchAlgorithm(
+            config={**self.search_config, "sol_per_pop": 20, "fitness_batch_size": 5}
+        )
 
-        causal_dag = CausalDAG(self.dag_dot_path)
-        z = Input("Z", int)
-        x = Input("X", float)
-        m = Input("M", int)
-        y = Output("Y", float)
-        scenario = Scenario(variables={z, x, m, y}, constraints={z <= 0, z >= 3, x <= 0, x >= 3, m <= 0, m >= 3})
-        specification = CausalSpecification(scenario, causal_dag)
+        with patch.object(
+            surrogate, "estimate_ate_calculated_batch", wraps=surrogate.estimate_ate_calculated_batch
+        ) as batch:
+            search_algorithm.search([surrogate], specification)
+        self.assertEqual(len(batch.call_args_list[0].args[0]), 5)
+        self.assertLessEqual(max(len(call.args[0]) for call in batch.call_args_list), 5)
 
+    def test_search_rejects_fitness_batch_size_larger_than_population(self):
+        specification = CausalSpecification(self.constrained_scenario, self.causal_dag)
+        c_s_a_test_case = CausalSurrogateAssistedTestCase(None, None, None)
+        surrogates = c_s_a_test_case.generate_surrogates(
+            specification, ObservationalDataCollector(self.constrained_scenario, self.class_df)
+        )
         search_algorithm = GeneticSearchAlgorithm(
-            config={
-                "parent_selection_type": "tournament",
-                "K_tournament": 4,
-                "mutation_type": "random",
-                "mutation_percent_genes": 50,
-                "mutation_by_replacement": True,
-            }
+            config={**self.search_config, "sol_per_pop": 20, "fitness_batch_size": 50}
         )
-        simulator = TestSimulator()
+        with self.assertRaises(ValueError):
+            search_algorithm.search(surrogates, specification)
 
-        c_s_a_test_case = CausalSurrogateAssistedTestCase(specification, search_algorithm, simulator)
+    def test_causal_surrogate_assisted_execution_no_executions(self):
+        specification = CausalSpecification(self.scenario, self.causal_dag)
+        c_s_a_test_case = CausalSurrogateAssistedTestCase(specification, None, TestSimulator())
 
         result, iterations, result_data = c_s_a_test_case.execute(
-            ObservationalDataCollector(scenario, df), custom_data_aggregator=data_double_aggregator
+            ObservationalDataCollector(self.scenario, self.class_df), 0
         )
 
-        self.assertIsInstance(result, SimulationResult)
-        self.assertEqual(iterations, 1)
-        self.assertEqual(len(result_data), 18)
+        self.assertEqual(result, "No fault found")
+        self.assertEqual(iterations, 0)
+        self.assertEqual(len(result_data), len(self.class_df))
 
     def test_causal_surrogate_assisted_execution_incorrect_search_config(self):
-        df = self.class_df.copy()
-
-        causal_dag = CausalDAG(self.dag_dot_path)
-        z = Input("Z", int)
-        x = Input("X", float)
-        m = Input("M", int)
-        y = Output("Y", float)
-        scenario = Scenario(variables={z, x, m, y}, constraints={z <= 0, z >= 3, x <= 0, x >= 3, m <= 0, m >= 3})
-        specification = CausalSpecification(scenario, causal_dag)
-
-        search_algorithm = GeneticSearchAlgorithm(
-            config={
-                "parent_selection_type": "tournament",
-                "K_tournament": 4,
-                "mutation_type": "random",
-                "mutation_percent_genes": 50,
-                "mutation_by_replacement": True,
-                "gene_space": "Something",
-            }
-        )
-        simulator = TestSimulator()
-
-        c_s_a_test_case = CausalSurrogateAssistedTestCase(specification, search_algorithm, simulator)
-
         self.assertRaises(
             ValueError,
-            c_s_a_test_case.execute,
-            data_collector=ObservationalDataCollector(scenario, df),
-            custom_data_aggregator=data_double_aggregator,
+            GeneticSearchAlgorithm,
+            config={**self.search_config, "gene_space": "Something"},
         )
 
-    def tearDown(self) -> None:
-        shutil.rmtree(self.temp_dir_path)
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.temp_dir.cleanup()
+
+
+CLASS_Z = np.arange(16, dtype=np.int32)
+CLASS_M = np.arange(16, 32, dtype=np.int32)
+CLASS_Y = np.arange(32, 16, -1, dtype=np.int32)
 
 
 def load_class_df():
     """Get the testing data and put into a dataframe."""
 
-    class_df = pd.DataFrame(
-        {"Z": np.arange(16), "X": np.arange(16), "M": np.arange(16, 32), "Y": np.arange(32, 16, -1)}
-    )
+    class_df = pd.DataFrame({"Z": CLASS_Z, "X": CLASS_Z, "M": CLASS_M, "Y": CLASS_Y})
     return class_df
 
 
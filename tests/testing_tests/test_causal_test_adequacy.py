@@ -15,6 +15,22 @@ from causal_testing.json_front.json_class import JsonUtility, CausalVariables
 from causal_testing.specification.scenario import Scenario
 from causal_testing.testing.causal_test_adequacy import DataAdequacy
 
+# Every pair of nodes in tests/resources/data/dag.dot
+DAG_PAIRS = frozenset(
+    {
+        ("B", "C"),
+        ("test_input_no_dist", "test_input"),
+        ("C", "test_output"),
+        ("test_input", "B"),
+        ("test_input_no_dist", "B"),
+        ("test_input", "test_output"),
+        ("test_input", "C"),
+        ("test_input_no_dist", "test_output"),
+        ("B", "test_output"),
+        ("test_input_no_dist", "C"),
+    }
+)
+
 
 class TestCausalTestAdequacy(unittest.TestCase):
     """
@@ -22,25 +38,27 @@ class TestCausalTestAdequacy(unittest.TestCase):
     ultimately whether we can stop testing.
     """
 
-    def setUp(self) -> None:
+    @classmethod
+    def setUpClass(cls) -> None:
+        # The JSON front end is set up once, since each test sets its own test plan before running it
         json_file_name = "tests.json"
         dag_file_name = "dag.dot"
         data_file_name = "data_with_categorical.csv"
         test_data_dir_path = Path("tests/resources/data")
-        self.json_path = str(test_data_dir_path / json_file_name)
-        self.dag_path = str(test_data_dir_path / dag_file_name)
-        self.data_path = [str(test_data_dir_path / data_file_name)]
-        self.json_class = JsonUtility("temp_out.txt", True)
-        self.example_distribution = scipy.stats.uniform(1, 10)
-        self.input_dict_list = [
-            {"name": "test_input", "datatype": float, "distribution": self.example_distribution},
+        cls.json_path = str(test_data_dir_path / json_file_name)
+        cls.dag_path = str(test_data_dir_path / dag_file_name)
+        cls.data_path = [str(test_data_dir_path / data_file_name)]
+        cls.json_class = JsonUtility("temp_out.txt", True)
+        cls.example_distribution = scipy.stats.uniform(1, 10)
+        cls.input_dict_list = [
+            {"name": "test_input", "datatype": float, "distribution": cls.example_distribution},
             {"name": "test_input_no_dist", "datatype": float},
         ]
-        self.output_dict_list = [{"name": "test_output", "datatype": float}]
-        variables = CausalVariables(inputs=self.input_dict_list, outputs=self.output_dict_list, metas=[])
-        self.scenario = Scenario(variables=variables, constraints=None)
-        self.json_class.set_paths(self.json_path, self.dag_path, self.data_path)
-        self.json_class.setup(self.scenario)
+        cls.output_dict_list = [{"name": "test_output", "datatype": float}]
+        variables = CausalVariables(inputs=cls.input_dict_list, outputs=cls.output_dict_list, metas=[])
+        cls.scenario = Scenario(variables=variables, constraints=None)
+        cls.json_class.set_paths(cls.json_path, cls.dag_path, cls.data_path)
+        cls.json_class.setup(cls.scenario)
 
     def test_data_adequacy_numeric(self):
         example_test = {
@@ -171,29 +189,8 @@ class TestCausalTestAdequacy(unittest.TestCase):
                 "causal_dag": self.json_class.causal_specification.causal_dag,
                 "test_suite": test_suite,
                 "tested_pairs": {("test_input", "B")},
-                "pairs_to_test": {
-                    ("B", "C"),
-                    ("test_input_no_dist", "test_input"),
-                    ("C", "test_output"),
-                    ("test_input", "B"),
-                    ("test_input_no_dist", "B"),
-                    ("test_input", "test_output"),
-                    ("test_input", "C"),
-                    ("test_input_no_dist", "test_output"),
-                    ("B", "test_output"),
-                    ("test_input_no_dist", "C"),
-                },
-                "untested_pairs": {
-                    ("B", "C"),
-                    ("test_input_no_dist", "test_input"),
-                    ("C", "test_output"),
-                    ("test_input_no_dist", "B"),
-                    ("test_input", "test_output"),
-                    ("test_input", "C"),
-                    ("test_input_no_dist", "test_output"),
-                    ("B", "test_output"),
-                    ("test_input_no_dist", "C"),
-                },
+                "pairs_to_test": DAG_PAIRS,
+                "untested_pairs": DAG_PAIRS - {("test_input", "B")},
                 "dag_adequacy": 0.1,
             },
         )
@@ -220,29 +217,8 @@ class TestCausalTestAdequacy(unittest.TestCase):
                 "causal_dag": self.json_class.causal_specification.causal_dag,
                 "test_suite": test_suite,
                 "tested_pairs": {("test_input", "C")},
-                "pairs_to_test": {
-                    ("B", "C"),
-                    ("test_input_no_dist", "test_input"),
-                    ("C", "test_output"),
-                    ("test_input", "B"),
-                    ("test_input_no_dist", "B"),
-                    ("test_input", "test_output"),
-                    ("test_input", "C"),
-                    ("test_input_no_dist", "test_output"),
-                    ("B", "test_output"),
-                    ("test_input_no_dist", "C"),
-                },
-                "untested_pairs": {
-                    ("B", "C"),
-                    ("test_input_no_dist", "test_input"),
-                    ("C", "test_output"),
-                    ("test_input_no_dist", "B"),
-                    ("test_input", "test_output"),
-                    ("test_input", "B"),
-                    ("test_input_no_dist", "test_output"),
-                    ("B", "test_output"),
-                    ("test_input_no_dist", "C"),
-                },
+                "pairs_to_test": DAG_PAIRS,
+                "untested_pairs": DAG_PAIRS - {("test_input", "C")},
                 "dag_adequacy": 0.1,
             },
         )
@@ -269,29 +245,8 @@ class TestCausalTestAdequacy(unittest.TestCase):
                 "causal_dag": self.json_class.causal_specification.causal_dag,
                 "test_suite": test_suite,
                 "tested_pairs": {("test_input", "C")},
-                "pairs_to_test": {
-                    ("B", "C"),
-                    ("test_input_no_dist", "test_input"),
-                    ("C", "test_output"),
-                    ("test_input", "B"),
-                    ("test_input_no_dist", "B"),
-                    ("test_input", "test_output"),
-                    ("test_input", "C"),
-                    ("test_input_no_dist", "test_output"),
-                    ("B", "test_output"),
-                    ("test_input_no_dist", "C"),
-                },
-                "untested_pairs": {
-                    ("B", "C"),
-                    ("test_input_no_dist", "test_input"),
-                    ("C", "test_output"),
-                    ("test_input_no_dist", "B"),
-                    ("test_input", "test_output"),
-                    ("test_input", "B"),
-                    ("test_input_no_dist", "test_output"),
-                    ("B", "test_output"),
-                    ("test_input_no_dist", "C"),
-                },
+                "pairs_to_test": DAG_PAIRS,
+                "untested_pairs": DAG_PAIRS - {("test_input", "C")},
                 "dag_adequacy": 0.1,
             },
         )
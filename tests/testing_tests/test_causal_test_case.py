@@ -45,6 +45,15 @@ class TestCausalTestCase(unittest.TestCase):
             " {Output: C::float}: ExactValue: 4±0.2.",
         )
 
+    def test_str_after_values_changed(self):
+        str(self.causal_test_case)
+        self.causal_test_case.treatment_value = 2
+        self.assertEqual(
+            str(self.causal_test_case),
+            "Running {'A': 2} instead of {'A': 0} should cause the following changes to"
+            " {Output: C::float}: ExactValue: 4±0.2.",
+        )
+
 
 class TestCausalTestExecution(unittest.TestCase):
     """Test the causal test execution workflow using observational data.
@@ -186,6 +195,27 @@ class TestCausalTestExecution(unittest.TestCase):
         causal_test_result = self.causal_test_case.execute_test(estimation_model, self.data_collector)
         pd.testing.assert_series_equal(causal_test_result.test_value.value, pd.Series(0.0), atol=1)
 
+    def test_execute_test_with_estimate_params(self):
+        """Check that estimate_params are passed on to the estimate method."""
+        causal_test_case = CausalTestCase(
+            base_test_case=self.base_test_case,
+            expected_causal_effect=self.expected_causal_effect,
+            control_value=0,
+            treatment_value=1,
+            estimate_type="ate_calculated",
+            estimate_params={"adjustment_config": {"D": 60}},
+        )
+        estimation_model = LinearRegressionEstimator(
+            "A",
+            self.treatment_value,
+            self.control_value,
+            self.minimal_adjustment_set,
+            "C",
+            self.df,
+        )
+        causal_test_result = causal_test_case.execute_test(estimation_model, self.data_collector)
+        pd.testing.assert_series_equal(causal_test_result.test_value.value, pd.Series(4.0), atol=1e-6)
+
     def test_invalid_estimate_type(self):
         """Check that executing the causal test case returns the correct results for dummy data using a linear
         regression estimator."""